@@ -1,8 +1,9 @@
 from django.contrib import admin
 
-from .models import AdGroup, AdGroupStats, Campaign
+from .models import AdGroup, AdGroupStats, AdGroupStatsDailyRollup, Campaign
 
 # Register your models here.
 admin.site.register(Campaign)
 admin.site.register(AdGroup)
 admin.site.register(AdGroupStats)
+admin.site.register(AdGroupStatsDailyRollup)
@@ -0,0 +1,130 @@
+import asyncio
+from functools import partial
+from inspect import isawaitable
+
+from asgiref.sync import sync_to_async
+from django.db import connection
+from rest_framework.response import Response
+from rest_framework.status import HTTP_400_BAD_REQUEST
+from rest_framework.views import APIView
+
+from .models import Campaign
+from .rollups import get_stats_queryset
+from .serializers import CampaignSerializer
+from .views import CampaignsListCreate, PerformanceComparisonRetrieve
+
+
+def run_in_own_connection(function, recorder=None):
+    """
+    Call ``function`` and close the database connection of the calling thread
+    afterwards, or return it to the pool, so executor threads do not keep
+    connections open for ``CONN_MAX_AGE``. Its queries are recorded by
+    ``recorder`` when it is given.
+    """
+    try:
+        if recorder is None:
+            return function()
+        with connection.execute_wrapper(recorder):
+            return function()
+    finally:
+        connection.close()
+
+
+async def run_concurrently(*functions, recorder=None):
+    """
+    Run the ``functions`` making database queries at the same time, each in a
+    worker thread with its own database connection, and return their results.
+    Pass the QueryRecorder of the request as ``recorder`` to count the queries
+    in its query budget.
+    """
+    return await asyncio.gather(
+        *(
+            sync_to_async(run_in_own_connection, thread_sensitive=False)(
+                function, recorder
+            )
+            for function in functions
+        )
+    )
+
+
+class AsyncAPIView(APIView):
+    """
+    APIView whose handlers are coroutines. Authentication, permissions and
+    throttling run in the request thread, then the handler runs on the event
+    loop.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(
+                    self, request.method.lower(), self.http_method_not_allowed
+                )
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            if isawaitable(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+class AsyncCampaignsList(AsyncAPIView, CampaignsListCreate):
+    http_method_names = ["get", "options"]
+
+    async def get(self, request, *args, **kwargs):
+        paginator = self.paginator
+        paginator.request = request
+        paginator.limit = paginator.get_limit(request)
+        paginator.offset = paginator.get_offset(request)
+
+        start, end = paginator.offset, paginator.offset + paginator.limit
+        campaign_ids = Campaign.objects.order_by("id").values_list("id", flat=True)
+        paginator.count, campaigns = await run_concurrently(
+            campaign_ids.count,
+            lambda: self.get_campaigns(list(campaign_ids[start:end])),
+            recorder=getattr(request, "query_recorder", None),
+        )
+        serializer = CampaignSerializer(campaigns, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+
+class AsyncPerformanceComparisonRetrieve(AsyncAPIView, PerformanceComparisonRetrieve):
+    async def get(self, request, *args, **kwargs):
+        serializer = self.get_query_serializer(request)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=HTTP_400_BAD_REQUEST)
+
+        compare_modes = list(dict.fromkeys(serializer.validated_data["compare_mode"]))
+        date_ranges = self.get_date_ranges(serializer.validated_data, compare_modes)
+
+        performances = await run_concurrently(
+            *(
+                partial(self.get_period_performance, prefix, date_range)
+                for prefix, date_range in date_ranges.items()
+            ),
+            recorder=getattr(request, "query_recorder", None),
+        )
+        performance = {
+            metric: value
+            for period_performance in performances
+            for metric, value in period_performance.items()
+        }
+        return Response(self.get_performance_data(performance, compare_modes))
+
+    def get_period_performance(self, prefix, date_range):
+        return (
+            get_stats_queryset(*date_range)
+            .filter(date__range=date_range)
+            .aggregate(**self.get_performance_aggregate(prefix, date_range))
+        )
@@ -0,0 +1,132 @@
+import binascii
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from knox.auth import TokenAuthentication
+from knox.crypto import hash_token
+from rest_framework import exceptions
+
+AUTH_TOKEN_CACHE_KEY = "analytics:auth-token:{}"
+
+LOCAL_TOKEN_CACHE_SIZE = 1024
+
+
+class LocalTokenCache:
+    """
+    Least recently used tokens validated by this process, each kept until its
+    own deadline. Keyed by the token itself, so a hit does not hash it.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, token):
+        with self.lock:
+            entry = self.entries.get(token)
+            if entry is None:
+                return None
+            if entry["deadline"] <= time.monotonic():
+                del self.entries[token]
+                return None
+            self.entries.move_to_end(token)
+            return entry
+
+    def set(self, token, entry):
+        with self.lock:
+            self.entries[token] = entry
+            self.entries.move_to_end(token)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def discard_digests(self, digests):
+        with self.lock:
+            for token, entry in list(self.entries.items()):
+                if entry["digest"] in digests:
+                    del self.entries[token]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+local_token_cache = LocalTokenCache(LOCAL_TOKEN_CACHE_SIZE)
+
+
+def get_auth_token_cache_key(digest):
+    return AUTH_TOKEN_CACHE_KEY.format(digest)
+
+
+def get_auth_token_cache_timeout(auth_token):
+    """
+    Return the seconds a validated token may be served from the cache: the
+    configured timeout, bounded by ``KNOX_EXPIRY`` and the token expiry.
+    """
+    timeout = min(
+        settings.ANALYTICS_AUTH_TOKEN_CACHE_TIMEOUT,
+        settings.KNOX_EXPIRY.total_seconds(),
+    )
+    if auth_token.expiry is not None:
+        timeout = min(timeout, (auth_token.expiry - timezone.now()).total_seconds())
+    return int(timeout)
+
+
+def invalidate_auth_tokens(digests):
+    """Forget the validated tokens with the given ``digests``."""
+    digests = set(digests)
+    cache.delete_many([get_auth_token_cache_key(digest) for digest in digests])
+    local_token_cache.discard_digests(digests)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Knox token authentication remembering the validated tokens, first in a
+    local LRU, then in the shared cache, so a warm request makes no database
+    query. Deleting a token, e.g. on logout, removes it from the shared cache
+    and the local LRU of this process. Other processes forget it after
+    ``ANALYTICS_AUTH_TOKEN_LOCAL_CACHE_TIMEOUT`` seconds.
+    """
+
+    def authenticate_credentials(self, token):
+        token_string = token.decode("utf-8")
+        entry = local_token_cache.get(token_string)
+        if entry is not None:
+            return entry["user"], entry["auth_token"]
+
+        try:
+            digest = hash_token(token_string)
+        except (TypeError, binascii.Error):
+            raise exceptions.AuthenticationFailed(_("Invalid token."))
+
+        cache_key = get_auth_token_cache_key(digest)
+        cached = cache.get(cache_key)
+        if cached is None:
+            user, auth_token = super().authenticate_credentials(token)
+            timeout = get_auth_token_cache_timeout(auth_token)
+            if timeout <= 0:
+                return user, auth_token
+            cache.set(cache_key, (user, auth_token), timeout)
+        else:
+            user, auth_token = cached
+            timeout = get_auth_token_cache_timeout(auth_token)
+            if timeout <= 0:
+                cache.delete(cache_key)
+                return super().authenticate_credentials(token)
+
+        local_token_cache.set(
+            token_string,
+            {
+                "digest": digest,
+                "user": user,
+                "auth_token": auth_token,
+                "deadline": time.monotonic()
+                + min(timeout, settings.ANALYTICS_AUTH_TOKEN_LOCAL_CACHE_TIMEOUT),
+            },
+        )
+        return user, auth_token
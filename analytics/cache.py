@@ -0,0 +1,169 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.utils.http import parse_etags, quote_etag
+from rest_framework.response import Response
+from rest_framework.status import HTTP_200_OK, HTTP_304_NOT_MODIFIED
+
+from .metrics import RESPONSE_CACHE_REQUESTS
+from .models import DataVersion
+
+RESPONSE_CACHE_STATS_KEY = "analytics:response_cache:{view}:{outcome}"
+LIST_QUERY_PARAMS = ("campaigns",)
+ORDERED_LIST_QUERY_PARAMS = ("compare_mode",)
+
+cached_views = set()
+
+
+def get_data_version(using="default"):
+    """
+    Return the current analytics data version. A missing row starts from the
+    current time, so a version is never reused for entries still cached.
+    """
+    version = (
+        DataVersion.objects.using(using)
+        .filter(pk=1)
+        .values_list("version", flat=True)
+        .first()
+    )
+    if version is None:
+        version = (
+            DataVersion.objects.using(using)
+            .get_or_create(pk=1, defaults={"version": time.time_ns()})[0]
+            .version
+        )
+    return version
+
+
+def bump_data_version(using="default"):
+    """
+    Invalidate every cached analytics response. Call it in the transaction of
+    the write, so the new version becomes visible together with the data.
+    """
+    updated = (
+        DataVersion.objects.using(using).filter(pk=1).update(version=F("version") + 1)
+    )
+    if not updated:
+        get_data_version(using)
+
+
+def get_request_data_version(request):
+    """Return the data version, read once per request."""
+    if not hasattr(request, "data_version"):
+        request.data_version = get_data_version()
+    return request.data_version
+
+
+def get_normalized_query_params(request):
+    """
+    Return the query parameters sorted by name, with the items of the comma
+    separated list parameters sorted and deduplicated. The items of ordered
+    list parameters, e.g. ``compare_mode`` whose first item fills the flat
+    fields of the response, are only deduplicated.
+    """
+    params = []
+    for name in sorted(request.query_params):
+        values = request.query_params.getlist(name)
+        if name in LIST_QUERY_PARAMS:
+            values = [
+                ",".join(
+                    sorted({item for value in values for item in value.split(",")})
+                )
+            ]
+        elif name in ORDERED_LIST_QUERY_PARAMS:
+            values = [",".join(dict.fromkeys(value.split(","))) for value in values]
+        params.append((name, values))
+    return params
+
+
+def get_response_cache_key(view, request):
+    params = repr(
+        (request.get_host(), request.path, get_normalized_query_params(request))
+    )
+    digest = hashlib.sha256(params.encode()).hexdigest()
+    return f"analytics:response:{view.__class__.__name__}:{get_request_data_version(request)}:{digest}"
+
+
+def get_response_etag(view, request):
+    """
+    Return the ETag of the response to ``request``. It only changes with the
+    data version or the normalized query parameters, so it is known before any
+    aggregate query runs.
+    """
+    key = get_response_cache_key(view, request)
+    return quote_etag(hashlib.sha256(key.encode()).hexdigest()[:32])
+
+
+def record_response_cache_outcome(view, outcome):
+    view_name = view.__class__.__name__
+    RESPONSE_CACHE_REQUESTS.labels(view_name, outcome).inc()
+    key = RESPONSE_CACHE_STATS_KEY.format(view=view_name, outcome=outcome)
+    if not cache.add(key, 1, timeout=None):
+        cache.incr(key)
+
+
+def get_response_cache_stats():
+    """Return the response cache hits and misses of every cached view."""
+    return {
+        view: {
+            outcome: cache.get(
+                RESPONSE_CACHE_STATS_KEY.format(view=view, outcome=outcome), 0
+            )
+            for outcome in ("hit", "miss")
+        }
+        for view in sorted(cached_views)
+    }
+
+
+def cache_response(handler):
+    """
+    Cache the successful responses of a view handler per data version and
+    normalized query parameters. The outcome is reported in the ``X-Cache``
+    header and counted per view.
+    """
+    cached_views.add(handler.__qualname__.split(".")[0])
+
+    @wraps(handler)
+    def wrapper(view, request, *args, **kwargs):
+        if not settings.ANALYTICS_RESPONSE_CACHE:
+            return handler(view, request, *args, **kwargs)
+
+        key = get_response_cache_key(view, request)
+        data = cache.get(key)
+        if data is not None:
+            record_response_cache_outcome(view, "hit")
+            return Response(data, headers={"X-Cache": "HIT"})
+
+        response = handler(view, request, *args, **kwargs)
+        if response.status_code == HTTP_200_OK:
+            cache.set(key, response.data, settings.ANALYTICS_RESPONSE_CACHE_TIMEOUT)
+            record_response_cache_outcome(view, "miss")
+            response["X-Cache"] = "MISS"
+        return response
+
+    return wrapper
+
+
+def conditional_response(handler):
+    """
+    Add an ``ETag`` to the successful responses of a view handler and answer
+    ``304 Not Modified`` without calling it when ``If-None-Match`` matches.
+    """
+
+    @wraps(handler)
+    def wrapper(view, request, *args, **kwargs):
+        etag = get_response_etag(view, request)
+        etags = parse_etags(request.headers.get("If-None-Match", ""))
+        if "*" in etags or etag in etags or f"W/{etag}" in etags:
+            return Response(status=HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        response = handler(view, request, *args, **kwargs)
+        if response.status_code == HTTP_200_OK:
+            response["ETag"] = etag
+        return response
+
+    return wrapper
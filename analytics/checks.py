@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Warn when the default cache is local to every process. The throttle
+    counters, the token cache and the cached responses are then not shared
+    by the workers, e.g. every worker allows the full throttle rate.
+    """
+    backend = settings.CACHES["default"]["BACKEND"]
+    if backend != "django.core.cache.backends.locmem.LocMemCache":
+        return []
+    return [
+        Warning(
+            "The default cache is local to every process.",
+            hint="Set REDIS_URL when more than one worker serves the APIs.",
+            id="analytics.W001",
+        )
+    ]
@@ -0,0 +1,55 @@
+import numpy as np
+
+
+def safe_divide(numerator, denominator):
+    """Divide element-wise, giving 0 wherever the denominator is 0."""
+    return np.divide(
+        numerator,
+        denominator,
+        out=np.zeros_like(numerator),
+        where=denominator != 0,
+    )
+
+
+def compute_time_series_ratios(buckets, dimensions=()):
+    """
+    Return the time series rows of ``buckets``, the summed metrics returned by
+    ``PerformanceTimeSeriesList.get_time_series_sums_queryset``, with every
+    ratio computed in one vectorized pass. The ``dimensions`` values of every
+    bucket are kept.
+    """
+    buckets = list(buckets)
+    total_cost = np.array([bucket["total_cost"] for bucket in buckets], dtype=float)
+    total_clicks = np.array([bucket["total_clicks"] for bucket in buckets], dtype=float)
+    total_conversions = np.array(
+        [bucket["total_conversions"] for bucket in buckets], dtype=float
+    )
+    total_impressions = np.array(
+        [bucket["total_impressions"] for bucket in buckets], dtype=float
+    )
+
+    ratios = zip(
+        safe_divide(total_cost, total_conversions).tolist(),
+        safe_divide(total_cost, total_clicks).tolist(),
+        safe_divide(total_clicks, total_impressions).tolist(),
+        safe_divide(total_conversions, total_clicks).tolist(),
+    )
+    return [
+        {
+            "time_granularity": bucket["time_granularity"],
+            "total_cost": bucket["total_cost"],
+            "total_clicks": bucket["total_clicks"],
+            "total_conversions": bucket["total_conversions"],
+            "average_cost_per_conversion": cost_per_conversion,
+            "average_cost_per_click": cost_per_click,
+            "average_click_through_rate": click_through_rate,
+            "average_conversion_rate": conversion_rate,
+            **{dimension: bucket[dimension] for dimension in dimensions},
+        }
+        for bucket, (
+            cost_per_conversion,
+            cost_per_click,
+            click_through_rate,
+            conversion_rate,
+        ) in zip(buckets, ratios)
+    ]
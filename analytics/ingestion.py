@@ -0,0 +1,123 @@
+import csv
+import io
+
+from django.db import connections, transaction
+
+from .cache import bump_data_version
+from .models import AdGroup, AdGroupStats
+from .rollups import mark_dates_dirty
+from .summaries import mark_campaigns_dirty
+
+STATS_COLUMNS = [
+    "date",
+    "ad_group_id",
+    "device",
+    "impressions",
+    "clicks",
+    "conversions",
+    "cost",
+]
+
+
+def read_stats_batches(file, batch_size, offset=0):
+    """
+    Yield ``(rows, offset)`` for every ``batch_size`` rows of a stats CSV file
+    opened in binary mode, where ``offset`` is the byte offset right after the
+    last row of the batch. Reading starts at ``offset`` when it is given, so an
+    interrupted ingestion can be resumed from the last reported offset.
+
+    The csv reader is fed one decoded line at a time, so a quoted value may
+    span several lines, and the bytes of every line are counted to know where
+    each record ends.
+    """
+    position = 0
+
+    def read_lines():
+        nonlocal position
+        encoding = "utf-8-sig"
+        for line in iter(file.readline, b""):
+            position += len(line)
+            yield line.decode(encoding)
+            encoding = "utf-8"
+
+    reader = csv.reader(read_lines())
+    header = next(reader, [])
+    missing_columns = [column for column in STATS_COLUMNS if column not in header]
+    if missing_columns:
+        raise ValueError(f"Missing columns: {', '.join(missing_columns)}")
+    column_indexes = [header.index(column) for column in STATS_COLUMNS]
+
+    if offset:
+        file.seek(offset)
+        position = offset
+
+    rows = []
+    for values in reader:
+        if not values:
+            continue
+        rows.append([values[index] for index in column_indexes])
+        if len(rows) == batch_size:
+            yield rows, position
+            rows = []
+    if rows:
+        yield rows, position
+
+
+def copy_from_stdin(cursor, sql, buffer):
+    """Run a ``COPY ... FROM STDIN`` statement with psycopg2 or psycopg 3."""
+    if hasattr(cursor, "copy_expert"):
+        cursor.copy_expert(sql, buffer)
+    else:
+        with cursor.copy(sql) as copy:
+            copy.write(buffer.getvalue())
+
+
+def upsert_stats(rows, using="default"):
+    """
+    Load stats rows with ``COPY FROM STDIN`` into a staging table and upsert
+    them on (date, ad_group_id, device), so restated rows overwrite the
+    existing ones. The last row of a key wins within a batch, comparing the
+    parsed date and ad group id, so e.g. "2024-1-5" and "2024-01-05" are the
+    same key. The dates and campaigns of the batch are marked dirty and cached
+    responses are invalidated in the same transaction.
+    """
+    date_field = AdGroupStats._meta.get_field("date")
+    rows_by_key = {}
+    for row in rows:
+        key = (date_field.to_python(row[0]), int(row[1]), row[2])
+        rows_by_key[key] = [*key, *row[3:]]
+    rows = rows_by_key.values()
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+
+    table = AdGroupStats._meta.db_table
+    columns = ", ".join(f'"{column}"' for column in STATS_COLUMNS)
+    key_columns = ", ".join(f'"{column}"' for column in STATS_COLUMNS[:3])
+    updates = ", ".join(
+        f'"{column}" = EXCLUDED."{column}"' for column in STATS_COLUMNS[3:]
+    )
+    with transaction.atomic(using=using):
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                f'DROP TABLE IF EXISTS "{table}_staging"; '
+                f'CREATE TEMPORARY TABLE "{table}_staging" ON COMMIT DROP AS '
+                f'SELECT {columns} FROM "{table}" WITH NO DATA'
+            )
+            copy_from_stdin(
+                cursor,
+                f'COPY "{table}_staging" ({columns}) FROM STDIN WITH (FORMAT csv)',
+                buffer,
+            )
+            cursor.execute(
+                f'INSERT INTO "{table}" ({columns}) '
+                f'SELECT {columns} FROM "{table}_staging" '
+                f"ON CONFLICT ({key_columns}) DO UPDATE SET {updates}"
+            )
+        mark_dates_dirty(row[0] for row in rows)
+        mark_campaigns_dirty(
+            AdGroup.objects.filter(id__in={row[1] for row in rows})
+            .values_list("campaign_id", flat=True)
+            .distinct()
+        )
+        bump_data_version(using)
@@ -0,0 +1,62 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from analytics.parquet import get_parquet_queryset, write_parquet_dataset
+
+
+def comma_separated_ids(value):
+    return [int(item) for item in value.split(",")]
+
+
+class Command(BaseCommand):
+    help = (
+        "Export AdGroupStats rows as Parquet files partitioned by month, with "
+        "dictionary encoded device and campaign_type columns."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("directory", help="Directory to write the files to.")
+        parser.add_argument(
+            "--start-date",
+            type=date.fromisoformat,
+            help="First date to export, YYYY-MM-DD.",
+        )
+        parser.add_argument(
+            "--end-date",
+            type=date.fromisoformat,
+            help="Last date to export, YYYY-MM-DD.",
+        )
+        parser.add_argument(
+            "--campaigns",
+            type=comma_separated_ids,
+            help="Comma separated campaign ids to export.",
+        )
+        parser.add_argument(
+            "--ad-groups",
+            type=comma_separated_ids,
+            help="Comma separated ad group ids to export.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100_000,
+            help="Number of rows fetched and written per row group.",
+        )
+
+    def handle(self, *args, **options):
+        queryset = get_parquet_queryset(
+            start_date=options["start_date"],
+            end_date=options["end_date"],
+            campaigns=options["campaigns"],
+            ad_groups=options["ad_groups"],
+        )
+        written = write_parquet_dataset(
+            queryset, options["directory"], batch_size=options["batch_size"]
+        )
+        for month, rows in written.items():
+            self.stdout.write(f"{rows} rows written for {month:%Y-%m}.")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"{sum(written.values())} ad group stats exported.")
+        )
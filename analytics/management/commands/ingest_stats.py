@@ -0,0 +1,59 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from analytics.ingestion import read_stats_batches, upsert_stats
+from analytics.summaries import refresh_campaign_summary
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream AdGroupStats rows from a CSV file into the database in bounded "
+        "batches with COPY FROM STDIN. Rows already stored for the same date, "
+        "ad group and device are overwritten. The campaign summary is "
+        "refreshed afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Path of the ad group stats CSV file.")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=50_000,
+            help="Number of rows loaded per transaction.",
+        )
+        parser.add_argument(
+            "--offset",
+            type=int,
+            default=0,
+            help="Byte offset to resume from, as reported by a previous run.",
+        )
+
+    def handle(self, *args, **options):
+        offset = options["offset"]
+        ingested = 0
+        started = time.monotonic()
+
+        with open(options["path"], "rb") as file:
+            try:
+                for rows, batch_offset in read_stats_batches(
+                    file, options["batch_size"], offset
+                ):
+                    upsert_stats(rows)
+                    ingested += len(rows)
+                    offset = batch_offset
+                    elapsed = time.monotonic() - started
+                    self.stdout.write(
+                        f"{ingested} rows ingested, offset {offset}, "
+                        f"{ingested / elapsed:.0f} rows/sec."
+                    )
+            except Exception as error:
+                raise CommandError(
+                    f"Ingestion failed: {error}. "
+                    f"Resume with --offset {offset} once it is fixed."
+                )
+
+        if ingested:
+            refreshed = refresh_campaign_summary()
+            self.stdout.write(f"{refreshed} dirty campaigns refreshed.")
+        self.stdout.write(self.style.SUCCESS(f"{ingested} ad group stats added."))
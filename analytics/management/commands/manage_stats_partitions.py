@@ -0,0 +1,69 @@
+from dateutil.relativedelta import relativedelta
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from analytics.partitions import (
+    DEFAULT_PARTITION,
+    create_monthly_partition,
+    detach_monthly_partition,
+    get_monthly_partitions,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the monthly AdGroupStats partitions ahead of time and detach "
+        "the partitions older than the retention period."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=3,
+            help="Number of future months to create partitions for.",
+        )
+        parser.add_argument(
+            "--retain-months",
+            type=int,
+            default=None,
+            help="Detach partitions older than this many months. Keep all by default.",
+        )
+        parser.add_argument(
+            "--backfill",
+            action="store_true",
+            help="Create partitions for every month found in the default partition.",
+        )
+
+    def handle(self, *args, **options):
+        current_month = timezone.now().date().replace(day=1)
+        months = [
+            current_month + relativedelta(months=offset)
+            for offset in range(options["months_ahead"] + 1)
+        ]
+
+        if options["backfill"]:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT DISTINCT date_trunc('month', date)::date "
+                    f'FROM "{DEFAULT_PARTITION}"'
+                )
+                months += [row[0] for row in cursor.fetchall()]
+
+        for month in sorted(set(months)):
+            if create_monthly_partition(month):
+                self.stdout.write(f"Created partition for {month:%Y-%m}.")
+
+        if options["retain_months"] is not None:
+            oldest_month = current_month - relativedelta(
+                months=options["retain_months"]
+            )
+            for month in get_monthly_partitions():
+                if month < oldest_month:
+                    detached_name = detach_monthly_partition(month)
+                    self.stdout.write(
+                        f"Detached partition for {month:%Y-%m} as {detached_name}."
+                    )
+
+        self.stdout.write(self.style.SUCCESS("Partitions are up to date."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from analytics.summaries import refresh_campaign_summary
+
+
+class Command(BaseCommand):
+    help = (
+        "Refresh the campaign summary materialized view concurrently, so the "
+        "campaigns API keeps reading it meanwhile."
+    )
+
+    def handle(self, *args, **options):
+        refreshed = refresh_campaign_summary()
+        self.stdout.write(self.style.SUCCESS(f"{refreshed} dirty campaigns refreshed."))
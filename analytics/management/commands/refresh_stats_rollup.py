@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from analytics.rollups import refresh_daily_rollup
+
+
+class Command(BaseCommand):
+    help = "Rebuild the daily AdGroupStats rollup for dates whose stats changed."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=31,
+            help="Number of dirty dates refreshed per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        refreshed = refresh_daily_rollup(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"{refreshed} dates refreshed."))
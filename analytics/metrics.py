@@ -0,0 +1,114 @@
+import hmac
+import os
+from functools import lru_cache
+
+from django.conf import settings
+from django.http import HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from rest_framework.permissions import BasePermission, IsAdminUser
+from rest_framework.views import APIView
+
+from .authentication import CachedTokenAuthentication
+
+REQUEST_DURATION = Histogram(
+    "analytics_request_duration_seconds",
+    "Time to respond to a request, by URL name.",
+    ["route"],
+)
+REQUEST_DB_DURATION = Histogram(
+    "analytics_request_db_duration_seconds",
+    "Time spent in SQL queries per request, by URL name.",
+    ["route"],
+)
+REQUEST_SERIALIZATION_DURATION = Histogram(
+    "analytics_request_serialization_duration_seconds",
+    "Time to render the response body, by URL name.",
+    ["route"],
+)
+REQUESTS = Counter(
+    "analytics_requests",
+    "Requests by URL name, method and status code.",
+    ["route", "method", "status"],
+)
+THROTTLED_REQUESTS = Counter(
+    "analytics_throttled_requests",
+    "Requests rejected with 429 Too Many Requests, by URL name.",
+    ["route"],
+)
+AUTHENTICATION_FAILURES = Counter(
+    "analytics_authentication_failures",
+    "Requests rejected with 401 Unauthorized, by URL name.",
+    ["route"],
+)
+RESPONSE_CACHE_REQUESTS = Counter(
+    "analytics_response_cache_requests",
+    "Response cache lookups by view and outcome.",
+    ["view", "outcome"],
+)
+
+
+def get_route(request):
+    """Return the URL name of ``request``, which bounds the label values."""
+    if request.resolver_match is None:
+        return "unmatched"
+    return request.resolver_match.view_name
+
+
+@lru_cache(maxsize=None)
+def get_route_histograms(route):
+    """
+    Return the latency, database time and serialization time histograms of
+    ``route``, so their labels are resolved once per route.
+    """
+    return (
+        REQUEST_DURATION.labels(route),
+        REQUEST_DB_DURATION.labels(route),
+        REQUEST_SERIALIZATION_DURATION.labels(route),
+    )
+
+
+def get_metrics_registry():
+    """
+    Return the registry to expose. When ``PROMETHEUS_MULTIPROC_DIR`` is set,
+    e.g. with several gunicorn workers, it aggregates the metrics every worker
+    writes in that directory.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+class HasMetricsToken(BasePermission):
+    """
+    Allow the requests bearing ``ANALYTICS_METRICS_TOKEN``. No request is
+    allowed by it when the token is not set.
+    """
+
+    def has_permission(self, request, view):
+        token = settings.ANALYTICS_METRICS_TOKEN
+        if not token:
+            return False
+        return hmac.compare_digest(
+            request.headers.get("Authorization", ""), f"Bearer {token}"
+        )
+
+
+class MetricsRetrieve(APIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [HasMetricsToken | IsAdminUser]
+    throttle_classes = []
+
+    def get(self, request, *args, **kwargs):
+        return HttpResponse(
+            generate_latest(get_metrics_registry()), content_type=CONTENT_TYPE_LATEST
+        )
@@ -0,0 +1,308 @@
+import logging
+import threading
+import time
+import zlib
+
+from django.conf import settings
+from django.db import connection
+from django.utils.cache import patch_vary_headers
+
+from .metrics import (
+    AUTHENTICATION_FAILURES,
+    REQUESTS,
+    THROTTLED_REQUESTS,
+    get_route,
+    get_route_histograms,
+)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+
+class GzipCompressor:
+    def __init__(self):
+        self.compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data):
+        return self.compressor.compress(data)
+
+    def flush(self):
+        return self.compressor.flush()
+
+
+class BrotliCompressor:
+    def __init__(self):
+        self.compressor = brotli.Compressor(quality=4)
+
+    def compress(self, data):
+        return self.compressor.process(data)
+
+    def flush(self):
+        return self.compressor.finish()
+
+
+class ZstdCompressor:
+    def __init__(self):
+        self.compressor = zstandard.ZstdCompressor(level=3).compressobj()
+
+    def compress(self, data):
+        return self.compressor.compress(data)
+
+    def flush(self):
+        return self.compressor.flush()
+
+
+COMPRESSORS = {"gzip": GzipCompressor}
+if zstandard:
+    COMPRESSORS["zstd"] = ZstdCompressor
+if brotli:
+    COMPRESSORS["br"] = BrotliCompressor
+
+
+def get_accepted_encoding(accept_encoding, encodings):
+    """
+    Return the first of ``encodings`` with the highest quality in the
+    ``Accept-Encoding`` header, or None when the client accepts none of them.
+    """
+    qualities = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[coding.strip().lower()] = quality
+
+    best_encoding, best_quality = None, 0.0
+    for encoding in encodings:
+        quality = qualities.get(encoding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best_encoding, best_quality = encoding, quality
+    return best_encoding
+
+
+def compress_stream(chunks, compressor):
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+async def acompress_stream(chunks, compressor):
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+class CompressionMiddleware:
+    """
+    Compress responses of at least ``ANALYTICS_COMPRESSION_MIN_SIZE`` bytes
+    with the best encoding of ``ANALYTICS_COMPRESSION_ENCODINGS`` the client
+    accepts. Brotli and Zstandard are used when their packages are installed.
+    Streaming responses are compressed chunk by chunk as they are sent, unless
+    their content type is already compressed.
+    """
+
+    incompressible_content_types = (
+        "application/vnd.apache.parquet",
+        "application/gzip",
+        "application/zip",
+        "image/",
+    )
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.encodings = [
+            encoding
+            for encoding in settings.ANALYTICS_COMPRESSION_ENCODINGS
+            if encoding in COMPRESSORS
+        ]
+
+    def __call__(self, request):
+        return self.process_response(request, self.get_response(request))
+
+    def process_response(self, request, response):
+        if not response.streaming and (
+            len(response.content) < settings.ANALYTICS_COMPRESSION_MIN_SIZE
+        ):
+            return response
+        if response.has_header("Content-Encoding"):
+            return response
+        if response.get("Content-Type", "").startswith(
+            self.incompressible_content_types
+        ):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = get_accepted_encoding(
+            request.META.get("HTTP_ACCEPT_ENCODING", ""), self.encodings
+        )
+        if encoding is None:
+            return response
+
+        compressor = COMPRESSORS[encoding]()
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = acompress_stream(
+                    response.streaming_content, compressor
+                )
+            else:
+                response.streaming_content = compress_stream(
+                    response.streaming_content, compressor
+                )
+            del response.headers["Content-Length"]
+        else:
+            content = compressor.compress(response.content) + compressor.flush()
+            if len(content) >= len(response.content):
+                return response
+            response.content = content
+            response.headers["Content-Length"] = str(len(content))
+
+        # A compressed representation only matches weakly, see RFC 9110
+        # Section 8.8.1.
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryRecorder:
+    """
+    Database execute wrapper recording the number of queries, their total
+    time and the slowest statement, without keeping every statement. It may
+    wrap the connections of several threads at once.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.slowest_sql = None
+        self.slowest_duration = 0.0
+        self.lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            with self.lock:
+                self.count += 1
+                self.duration += duration
+                if self.slowest_sql is None or duration > self.slowest_duration:
+                    self.slowest_sql = sql
+                    self.slowest_duration = duration
+
+
+class QueryBudgetMiddleware:
+    """
+    Record the queries of every request and check them against the budget of
+    its view in ``ANALYTICS_QUERY_BUDGETS``, keyed by URL name, e.g.
+    ``{"campaigns": {"queries": 5, "time": 500}}`` with the time in
+    milliseconds. A request over budget logs a warning. When
+    ``ANALYTICS_QUERY_BUDGET_STRICT`` is set, as in the tests, a request over
+    its query budget raises QueryBudgetExceeded instead; the time budget only
+    ever warns, since database time varies too much from run to run. Queries
+    run while a streaming response is sent are not counted.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = request.query_recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+        self.check_budget(request, recorder)
+        return response
+
+    def check_budget(self, request, recorder):
+        if request.resolver_match is None:
+            return
+        view_name = request.resolver_match.view_name
+        logger.debug(
+            "%s ran %d queries in %.1f ms",
+            view_name,
+            recorder.count,
+            recorder.duration * 1000,
+        )
+
+        budget = settings.ANALYTICS_QUERY_BUDGETS.get(view_name)
+        if budget is None:
+            return
+        max_queries = budget.get("queries")
+        max_duration = budget.get("time")
+        over_queries = max_queries is not None and recorder.count > max_queries
+        over_duration = (
+            max_duration is not None and recorder.duration * 1000 > max_duration
+        )
+        if not over_queries and not over_duration:
+            return
+
+        message = (
+            f"{view_name} ran {recorder.count} queries in "
+            f"{recorder.duration * 1000:.1f} ms, over its budget of "
+            f"{max_queries} queries and {max_duration} ms. The slowest took "
+            f"{recorder.slowest_duration * 1000:.1f} ms: {recorder.slowest_sql}"
+        )
+        if over_queries and settings.ANALYTICS_QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+
+class MetricsMiddleware:
+    """
+    Record the latency, database time and render time of every request in
+    histograms per URL name, and count the requests by status code. Database
+    time is read from the recorder of QueryBudgetMiddleware, so it must come
+    after this middleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        response = self.get_response(request)
+        duration = time.perf_counter() - started
+
+        route = get_route(request)
+        duration_histogram, db_duration_histogram, _ = get_route_histograms(route)
+        duration_histogram.observe(duration)
+        recorder = getattr(request, "query_recorder", None)
+        if recorder is not None:
+            db_duration_histogram.observe(recorder.duration)
+        REQUESTS.labels(route, request.method, response.status_code).inc()
+        if response.status_code == 429:
+            THROTTLED_REQUESTS.labels(route).inc()
+        elif response.status_code == 401:
+            AUTHENTICATION_FAILURES.labels(route).inc()
+        return response
+
+    def process_template_response(self, request, response):
+        started = time.perf_counter()
+        _, _, histogram = get_route_histograms(get_route(request))
+        response.add_post_render_callback(
+            lambda response: histogram.observe(time.perf_counter() - started)
+        )
+        return response
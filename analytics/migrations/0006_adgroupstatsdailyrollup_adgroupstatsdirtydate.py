@@ -0,0 +1,85 @@
+# Generated by Django 5.1.4 on 2026-10-17 20:30
+
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def mark_existing_stats_dates_dirty(apps, schema_editor):
+    AdGroupStats = apps.get_model("analytics", "AdGroupStats")
+    AdGroupStatsDirtyDate = apps.get_model("analytics", "AdGroupStatsDirtyDate")
+    AdGroupStatsDirtyDate.objects.bulk_create(
+        [
+            AdGroupStatsDirtyDate(date=date)
+            for date in AdGroupStats.objects.values_list("date", flat=True).distinct()
+        ],
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0005_adgroup_ad_group_name_unique"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AdGroupStatsDirtyDate",
+            fields=[
+                ("date", models.DateField(primary_key=True, serialize=False)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="AdGroupStatsDailyRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("impressions", models.PositiveIntegerField(default=0)),
+                ("clicks", models.PositiveIntegerField(default=0)),
+                ("conversions", models.FloatField(default=0)),
+                ("cost", models.FloatField(default=0)),
+                ("date", models.DateField()),
+                (
+                    "device",
+                    models.CharField(
+                        choices=[
+                            ("DESKTOP", "Desktop"),
+                            ("MOBILE", "Mobile"),
+                            ("TABLET", "Tablet"),
+                        ],
+                        max_length=50,
+                    ),
+                ),
+                (
+                    "campaign",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to="analytics.campaign",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    django.contrib.postgres.indexes.BTreeIndex(
+                        fields=["date"], name="rollup_date"
+                    ),
+                    django.contrib.postgres.indexes.BTreeIndex(
+                        fields=["campaign", "date"], name="rollup_campaign_date"
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(
+            mark_existing_stats_dates_dirty, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.1.4 on 2026-10-17 20:32
+
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.contrib.postgres.operations import (
+    AddIndexConcurrently,
+    RemoveIndexConcurrently,
+)
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("analytics", "0006_adgroupstatsdailyrollup_adgroupstatsdirtydate"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="adgroupstats",
+            index=django.contrib.postgres.indexes.BrinIndex(
+                fields=["date"], name="ad_group_stats_date_brin"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="adgroupstats",
+            index=django.contrib.postgres.indexes.BTreeIndex(
+                fields=["ad_group", "date"],
+                include=("impressions", "clicks", "conversions", "cost"),
+                name="ad_group_stats_ad_group_date",
+            ),
+        ),
+        RemoveIndexConcurrently(
+            model_name="adgroupstats",
+            name="ad_group_date",
+        ),
+        migrations.AlterField(
+            model_name="adgroupstats",
+            name="ad_group",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="analytics.adgroup",
+            ),
+        ),
+        RemoveIndexConcurrently(
+            model_name="adgroupstatsdailyrollup",
+            name="rollup_campaign_date",
+        ),
+        AddIndexConcurrently(
+            model_name="adgroupstatsdailyrollup",
+            index=django.contrib.postgres.indexes.BTreeIndex(
+                fields=["campaign", "date"],
+                include=("impressions", "clicks", "conversions", "cost"),
+                name="rollup_campaign_date",
+            ),
+        ),
+    ]
@@ -0,0 +1,99 @@
+from dateutil.relativedelta import relativedelta
+from django.db import migrations
+from django.utils import timezone
+
+MONTHS_AHEAD = 3
+
+STATS_INDEXES_SQL = """
+ALTER TABLE "analytics_adgroupstats"
+    ADD CONSTRAINT "analytics_adgroupstats_pkey" PRIMARY KEY ("id", "date");
+ALTER TABLE "analytics_adgroupstats"
+    ADD CONSTRAINT "analytics_adgroupsta_ad_group_id_4e305dd4_fk_analytics"
+    FOREIGN KEY ("ad_group_id") REFERENCES "analytics_adgroup" ("id")
+    DEFERRABLE INITIALLY DEFERRED;
+CREATE INDEX "ad_group_stats_date_brin"
+    ON "analytics_adgroupstats" USING brin ("date");
+CREATE INDEX "ad_group_stats_ad_group_date"
+    ON "analytics_adgroupstats" ("ad_group_id", "date")
+    INCLUDE ("impressions", "clicks", "conversions", "cost");
+"""
+
+
+def create_monthly_partitions(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT MIN("date"), MAX("date") FROM "analytics_adgroupstats_unpartitioned"'
+        )
+        first_date, last_date = cursor.fetchone()
+
+    current_month = timezone.now().date().replace(day=1)
+    month = min(first_date or current_month, current_month).replace(day=1)
+    last_month = max(
+        last_date or current_month,
+        current_month + relativedelta(months=MONTHS_AHEAD),
+    )
+    while month <= last_month:
+        next_month = month + relativedelta(months=1)
+        schema_editor.execute(
+            f'CREATE TABLE "analytics_adgroupstats_{month:%Y%m}" '
+            'PARTITION OF "analytics_adgroupstats" '
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month.isoformat()}')"
+        )
+        month = next_month
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0007_analytics_access_path_indexes"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+            ALTER TABLE "analytics_adgroupstats"
+                RENAME TO "analytics_adgroupstats_unpartitioned";
+            CREATE TABLE "analytics_adgroupstats" (
+                LIKE "analytics_adgroupstats_unpartitioned" INCLUDING CONSTRAINTS
+            ) PARTITION BY RANGE ("date");
+            CREATE TABLE "analytics_adgroupstats_default"
+                PARTITION OF "analytics_adgroupstats" DEFAULT;
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.RunPython(create_monthly_partitions, migrations.RunPython.noop),
+        migrations.RunSQL(
+            sql="""
+            INSERT INTO "analytics_adgroupstats"
+                SELECT * FROM "analytics_adgroupstats_unpartitioned";
+            DROP TABLE "analytics_adgroupstats_unpartitioned";
+            CREATE SEQUENCE "analytics_adgroupstats_id_seq"
+                OWNED BY "analytics_adgroupstats"."id";
+            ALTER TABLE "analytics_adgroupstats" ALTER COLUMN "id"
+                SET DEFAULT nextval('analytics_adgroupstats_id_seq');
+            SELECT setval('analytics_adgroupstats_id_seq', COALESCE(MAX("id"), 0) + 1, false)
+                FROM "analytics_adgroupstats";
+            """
+            + STATS_INDEXES_SQL,
+            reverse_sql="""
+            CREATE TABLE "analytics_adgroupstats_unpartitioned" (
+                LIKE "analytics_adgroupstats" INCLUDING CONSTRAINTS
+            );
+            INSERT INTO "analytics_adgroupstats_unpartitioned"
+                SELECT * FROM "analytics_adgroupstats";
+            DROP TABLE "analytics_adgroupstats" CASCADE;
+            ALTER TABLE "analytics_adgroupstats_unpartitioned"
+                RENAME TO "analytics_adgroupstats";
+            ALTER TABLE "analytics_adgroupstats" ALTER COLUMN "id"
+                ADD GENERATED BY DEFAULT AS IDENTITY;
+            SELECT setval(
+                pg_get_serial_sequence('analytics_adgroupstats', 'id'),
+                COALESCE(MAX("id"), 0) + 1,
+                false
+            ) FROM "analytics_adgroupstats";
+            """
+            + STATS_INDEXES_SQL.replace(
+                'PRIMARY KEY ("id", "date")', 'PRIMARY KEY ("id")'
+            ),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.4 on 2026-10-17 20:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0008_partition_adgroupstats_by_month"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+            WITH duplicates AS (
+                DELETE FROM "analytics_adgroupstats" stats
+                USING "analytics_adgroupstats" latest
+                WHERE stats."date" = latest."date"
+                    AND stats."ad_group_id" = latest."ad_group_id"
+                    AND stats."device" = latest."device"
+                    AND stats."id" < latest."id"
+                RETURNING stats."date"
+            )
+            INSERT INTO "analytics_adgroupstatsdirtydate" ("date")
+                SELECT DISTINCT "date" FROM duplicates
+                ON CONFLICT DO NOTHING;
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddConstraint(
+            model_name="adgroupstats",
+            constraint=models.UniqueConstraint(
+                fields=("date", "ad_group", "device"),
+                name="ad_group_date_device_unique",
+            ),
+        ),
+    ]
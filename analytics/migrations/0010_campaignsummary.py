@@ -0,0 +1,87 @@
+# Generated by Django 5.1.4 on 2026-10-17 21:10
+
+import django.contrib.postgres.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0009_adgroupstats_ad_group_date_device_unique"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CampaignSummary",
+            fields=[
+                (
+                    "campaign",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="summary",
+                        serialize=False,
+                        to="analytics.campaign",
+                    ),
+                ),
+                ("ad_group_count", models.PositiveIntegerField()),
+                (
+                    "ad_group_names",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.CharField(max_length=50, null=True), size=None
+                    ),
+                ),
+                ("average_monthly_cost", models.FloatField(null=True)),
+                ("average_cost_per_conversion", models.FloatField(null=True)),
+            ],
+            options={
+                "db_table": "analytics_campaignsummary",
+                "managed": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="CampaignSummaryDirtyCampaign",
+            fields=[
+                (
+                    "campaign_id",
+                    models.PositiveBigIntegerField(primary_key=True, serialize=False),
+                ),
+                ("marked_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunSQL(
+            sql="""
+            CREATE MATERIALIZED VIEW "analytics_campaignsummary" AS
+            SELECT campaign."id" AS "campaign_id",
+                COUNT(ad_group."id") AS "ad_group_count",
+                ARRAY_AGG(DISTINCT ad_group."name") AS "ad_group_names",
+                stats."average_monthly_cost",
+                stats."average_cost_per_conversion"
+            FROM "analytics_campaign" campaign
+            LEFT JOIN "analytics_adgroup" ad_group
+                ON ad_group."campaign_id" = campaign."id"
+            LEFT JOIN (
+                SELECT ad_group."campaign_id",
+                    SUM(stats."cost")
+                        / COUNT(DISTINCT DATE_TRUNC('month', stats."date"))
+                        AS "average_monthly_cost",
+                    CASE
+                        WHEN SUM(stats."conversions") = 0 THEN 0
+                        ELSE SUM(stats."cost") / SUM(stats."conversions")
+                    END AS "average_cost_per_conversion"
+                FROM "analytics_adgroupstats" stats
+                JOIN "analytics_adgroup" ad_group
+                    ON ad_group."id" = stats."ad_group_id"
+                GROUP BY ad_group."campaign_id"
+            ) stats ON stats."campaign_id" = campaign."id"
+            GROUP BY campaign."id",
+                stats."average_monthly_cost",
+                stats."average_cost_per_conversion";
+
+            CREATE UNIQUE INDEX "campaign_summary_campaign_id"
+                ON "analytics_campaignsummary" ("campaign_id");
+            """,
+            reverse_sql='DROP MATERIALIZED VIEW "analytics_campaignsummary";',
+        ),
+    ]
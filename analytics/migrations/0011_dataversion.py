@@ -0,0 +1,35 @@
+# Generated by Django 5.1.4 on 2026-10-17 21:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0010_campaignsummary"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DataVersion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("version", models.BigIntegerField()),
+            ],
+        ),
+        migrations.RunSQL(
+            sql="""
+            INSERT INTO "analytics_dataversion" ("id", "version")
+            VALUES (1, (EXTRACT(EPOCH FROM clock_timestamp()) * 1e9)::bigint)
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -1,4 +1,5 @@
-from django.contrib.postgres.indexes import BTreeIndex
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import BrinIndex, BTreeIndex
 from django.db import models
 
 from .enums import AdGroupDeviceChoices, CampaignTypeChoices
@@ -44,8 +45,75 @@ class AdGroupStatsMetricMixin(models.Model):
 
 class AdGroupStats(AdGroupStatsMetricMixin):
     date = models.DateField()
-    ad_group = models.ForeignKey("AdGroup", on_delete=models.CASCADE)
+    ad_group = models.ForeignKey("AdGroup", on_delete=models.CASCADE, db_index=False)
     device = models.CharField(max_length=50, choices=AdGroupDeviceChoices.choices)
 
     class Meta:
-        indexes = [BTreeIndex(fields=["date"], name="ad_group_date")]
+        indexes = [
+            BrinIndex(fields=["date"], name="ad_group_stats_date_brin"),
+            BTreeIndex(
+                fields=["ad_group", "date"],
+                include=["impressions", "clicks", "conversions", "cost"],
+                name="ad_group_stats_ad_group_date",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["date", "ad_group", "device"],
+                name="ad_group_date_device_unique",
+            )
+        ]
+
+
+class AdGroupStatsDailyRollup(AdGroupStatsMetricMixin):
+    date = models.DateField()
+    campaign = models.ForeignKey(
+        "Campaign", on_delete=models.SET_NULL, null=True, blank=True
+    )
+    device = models.CharField(max_length=50, choices=AdGroupDeviceChoices.choices)
+
+    class Meta:
+        indexes = [
+            BTreeIndex(fields=["date"], name="rollup_date"),
+            BTreeIndex(
+                fields=["campaign", "date"],
+                include=["impressions", "clicks", "conversions", "cost"],
+                name="rollup_campaign_date",
+            ),
+        ]
+
+
+class AdGroupStatsDirtyDate(models.Model):
+    date = models.DateField(primary_key=True)
+
+
+class CampaignSummary(models.Model):
+    campaign = models.OneToOneField(
+        "Campaign",
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        related_name="summary",
+    )
+    ad_group_count = models.PositiveIntegerField()
+    ad_group_names = ArrayField(models.CharField(max_length=50, null=True))
+    average_monthly_cost = models.FloatField(null=True)
+    average_cost_per_conversion = models.FloatField(null=True)
+
+    class Meta:
+        managed = False
+        db_table = "analytics_campaignsummary"
+
+
+class CampaignSummaryDirtyCampaign(models.Model):
+    campaign_id = models.PositiveBigIntegerField(primary_key=True)
+    marked_at = models.DateTimeField(auto_now=True)
+
+
+class DataVersion(models.Model):
+    """
+    Single row counting the changes of the analytics data. Cached responses
+    and ETags belong to a version, and keeping it in the database makes every
+    process, e.g. the web workers and ingest_stats, see the same one.
+    """
+
+    version = models.BigIntegerField()
@@ -0,0 +1,14 @@
+from rest_framework.pagination import CursorPagination
+
+
+class TimeGranularityCursorPagination(CursorPagination):
+    """
+    Keyset pagination over aggregated time series buckets.
+
+    Each page is fetched with ``WHERE time_granularity > :cursor``, so deep
+    pages cost the same as the first one.
+    """
+
+    ordering = "time_granularity"
+    page_size_query_param = "limit"
+    max_page_size = 1000
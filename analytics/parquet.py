@@ -0,0 +1,147 @@
+from itertools import groupby
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from django.db.models import F
+
+from .models import AdGroupStats
+
+PARQUET_SCHEMA = pa.schema(
+    [
+        ("date", pa.date32()),
+        ("campaign_id", pa.int64()),
+        ("campaign_type", pa.dictionary(pa.int8(), pa.string())),
+        ("ad_group_id", pa.int64()),
+        ("device", pa.dictionary(pa.int8(), pa.string())),
+        ("impressions", pa.int64()),
+        ("clicks", pa.int64()),
+        ("conversions", pa.float64()),
+        ("cost", pa.float64()),
+    ]
+)
+
+
+def get_parquet_queryset(
+    start_date=None, end_date=None, campaigns=None, ad_groups=None
+):
+    filter_condition = {}
+    if start_date:
+        filter_condition["date__gte"] = start_date
+    if end_date:
+        filter_condition["date__lte"] = end_date
+    if campaigns:
+        filter_condition["ad_group__campaign_id__in"] = campaigns
+    if ad_groups:
+        filter_condition["ad_group_id__in"] = ad_groups
+
+    return (
+        AdGroupStats.objects.filter(**filter_condition)
+        .annotate(
+            campaign_id=F("ad_group__campaign_id"),
+            campaign_type=F("ad_group__campaign__campaign_type"),
+        )
+        .order_by("date", "id")
+        .values_list(*PARQUET_SCHEMA.names)
+    )
+
+
+def iter_parquet_batches(queryset, batch_size):
+    """
+    Yield ``(month, table)`` for every ``batch_size`` rows of a queryset from
+    ``get_parquet_queryset``, read through a server-side cursor. A table never
+    spans two months.
+    """
+    rows = queryset.iterator(chunk_size=batch_size)
+    for month, month_rows in groupby(rows, key=lambda row: row[0].replace(day=1)):
+        batch = []
+        for row in month_rows:
+            batch.append(row)
+            if len(batch) == batch_size:
+                yield month, build_table(batch)
+                batch = []
+        if batch:
+            yield month, build_table(batch)
+
+
+def build_table(rows):
+    columns = list(zip(*rows))
+    return pa.Table.from_arrays(
+        [
+            (
+                pa.array(column, type=field.type.value_type)
+                .dictionary_encode()
+                .cast(field.type)
+                if pa.types.is_dictionary(field.type)
+                else pa.array(column, type=field.type)
+            )
+            for field, column in zip(PARQUET_SCHEMA, columns)
+        ],
+        schema=PARQUET_SCHEMA,
+    )
+
+
+def write_parquet_dataset(queryset, directory, batch_size=100_000):
+    """
+    Write the rows of a queryset from ``get_parquet_queryset`` under
+    ``directory`` as one Parquet file per month, in ``month=YYYY-MM``
+    partition directories. Return the number of rows written per month.
+    """
+    written = {}
+    writer = None
+    for month, table in iter_parquet_batches(queryset, batch_size):
+        if month not in written:
+            if writer:
+                writer.close()
+            path = Path(directory) / f"month={month:%Y-%m}" / "part-0.parquet"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            writer = pq.ParquetWriter(path, PARQUET_SCHEMA)
+            written[month] = 0
+        writer.write_table(table)
+        written[month] += table.num_rows
+    if writer:
+        writer.close()
+    return written
+
+
+class ChunkSink:
+    """Write-only file collecting the bytes written since the last ``drain``."""
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def iter_parquet_file(queryset, batch_size=100_000):
+    """
+    Yield the bytes of a single Parquet file holding the rows of a queryset
+    from ``get_parquet_queryset``, one row group per month batch, as soon as
+    every row group is written.
+    """
+    sink = ChunkSink()
+    writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), PARQUET_SCHEMA)
+    for _, table in iter_parquet_batches(queryset, batch_size):
+        writer.write_table(table)
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
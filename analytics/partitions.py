@@ -0,0 +1,105 @@
+import re
+from datetime import date
+
+from dateutil.relativedelta import relativedelta
+from django.db import connections, transaction
+from django.utils import timezone
+
+from .cache import bump_data_version
+from .models import AdGroupStats, AdGroupStatsDailyRollup
+from .summaries import mark_campaigns_dirty
+
+PARENT_TABLE = AdGroupStats._meta.db_table
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+MONTHLY_PARTITION_PATTERN = re.compile(rf"^{PARENT_TABLE}_(\d{{4}})(\d{{2}})$")
+
+
+def get_partition_name(month):
+    return f"{PARENT_TABLE}_{month:%Y%m}"
+
+
+def get_monthly_partitions(using="default"):
+    """Return the first day of the month of every attached monthly partition."""
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON pg_inherits.inhparent = parent.oid "
+            "JOIN pg_class child ON pg_inherits.inhrelid = child.oid "
+            "WHERE parent.relname = %s",
+            [PARENT_TABLE],
+        )
+        partition_names = [row[0] for row in cursor.fetchall()]
+
+    months = []
+    for partition_name in partition_names:
+        match = MONTHLY_PARTITION_PATTERN.match(partition_name)
+        if match:
+            months.append(date(int(match[1]), int(match[2]), 1))
+    return sorted(months)
+
+
+def create_monthly_partition(month, using="default"):
+    """
+    Create and attach the partition holding ``month``, moving any of its rows
+    out of the default partition. Return False when it already exists.
+    """
+    start_date = month.replace(day=1)
+    end_date = start_date + relativedelta(months=1)
+    partition_name = get_partition_name(start_date)
+
+    with transaction.atomic(using=using), connections[using].cursor() as cursor:
+        cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [partition_name])
+        if cursor.fetchone()[0]:
+            return False
+
+        # Block the inserts routed to the default partition until the
+        # partition is attached, or a row of the month inserted meanwhile
+        # would make ATTACH PARTITION fail.
+        cursor.execute(f'LOCK TABLE "{DEFAULT_PARTITION}" IN SHARE ROW EXCLUSIVE MODE')
+        cursor.execute(
+            f'CREATE TABLE "{partition_name}" '
+            f'(LIKE "{PARENT_TABLE}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+        )
+        cursor.execute(
+            f'WITH moved AS (DELETE FROM "{DEFAULT_PARTITION}" '
+            f"WHERE date >= %s AND date < %s RETURNING *) "
+            f'INSERT INTO "{partition_name}" SELECT * FROM moved',
+            [start_date, end_date],
+        )
+        cursor.execute(
+            f'ALTER TABLE "{PARENT_TABLE}" ATTACH PARTITION "{partition_name}" '
+            f"FOR VALUES FROM ('{start_date.isoformat()}') "
+            f"TO ('{end_date.isoformat()}')"
+        )
+    return True
+
+
+def detach_monthly_partition(month, using="default"):
+    """
+    Detach the partition holding ``month`` and return its new name. The table
+    and its rows are kept but are no longer visible through AdGroupStats. It
+    is renamed, so the partition of the month can be created again. The daily
+    rollup rows of the month are deleted, its campaigns are marked dirty and
+    cached responses are invalidated in the same transaction.
+    """
+    start_date = month.replace(day=1)
+    end_date = start_date + relativedelta(months=1)
+    partition_name = get_partition_name(start_date)
+    detached_name = f"{partition_name}_detached_{timezone.now():%Y%m%d%H%M%S}"
+    with transaction.atomic(using=using), connections[using].cursor() as cursor:
+        campaign_ids = list(
+            AdGroupStats.objects.using(using)
+            .filter(date__gte=start_date, date__lt=end_date)
+            .values_list("ad_group__campaign_id", flat=True)
+            .distinct()
+        )
+        cursor.execute(
+            f'ALTER TABLE "{PARENT_TABLE}" DETACH PARTITION "{partition_name}"'
+        )
+        cursor.execute(f'ALTER TABLE "{partition_name}" RENAME TO "{detached_name}"')
+        AdGroupStatsDailyRollup.objects.using(using).filter(
+            date__gte=start_date, date__lt=end_date
+        ).delete()
+        mark_campaigns_dirty(campaign_ids)
+        bump_data_version(using)
+    return detached_name
@@ -0,0 +1,37 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+encoder = JSONEncoder()
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer encoding with orjson, which writes dicts, lists, dates and
+    floats natively. Types orjson does not know, e.g. Decimal or lazy
+    translations, go through DRF's JSONEncoder. Indented output, as requested
+    by the browsable API, is left to JSONRenderer.
+
+    The output differs from JSONRenderer's in a few cases: datetimes keep
+    their microseconds, some floats are written in another notation, e.g.
+    0.00001 instead of 1e-05, and NaN and Infinity are written as null where
+    JSONRenderer raises ValueError.
+    """
+
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=encoder.default, option=self.options)
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            # Escape U+2028 and U+2029 like JSONRenderer, so the output is
+            # valid JavaScript.
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                b"\xe2\x80\xa9", b"\\u2029"
+            )
+        return ret
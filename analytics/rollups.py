@@ -0,0 +1,82 @@
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Sum
+
+from .models import AdGroupStats, AdGroupStatsDailyRollup, AdGroupStatsDirtyDate
+
+
+def mark_dates_dirty(dates):
+    AdGroupStatsDirtyDate.objects.bulk_create(
+        [AdGroupStatsDirtyDate(date=date) for date in set(dates)],
+        ignore_conflicts=True,
+    )
+
+
+def refresh_daily_rollup(batch_size=31):
+    """
+    Rebuild the daily rollup rows of every dirty date, ``batch_size`` dates per
+    transaction, and return the number of dates refreshed.
+
+    The dirty dates are deleted before their stats are aggregated. Marking one
+    of them dirty again waits for the transaction on the deleted row, then
+    inserts it anew, so stats written during the refresh are not lost.
+    """
+    table = AdGroupStatsDirtyDate._meta.db_table
+    refreshed = 0
+    while True:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM "{table}" WHERE "date" IN ('
+                f'SELECT "date" FROM "{table}" ORDER BY "date" LIMIT %s '
+                "FOR UPDATE SKIP LOCKED) "
+                'RETURNING "date"',
+                [batch_size],
+            )
+            dates = [row[0] for row in cursor.fetchall()]
+            if not dates:
+                return refreshed
+
+            daily_stats = (
+                AdGroupStats.objects.filter(date__in=dates)
+                .values("date", "device", campaign_id=F("ad_group__campaign_id"))
+                .annotate(
+                    total_impressions=Sum("impressions"),
+                    total_clicks=Sum("clicks"),
+                    total_conversions=Sum("conversions"),
+                    total_cost=Sum("cost"),
+                )
+            )
+            AdGroupStatsDailyRollup.objects.filter(date__in=dates).delete()
+            AdGroupStatsDailyRollup.objects.bulk_create(
+                [
+                    AdGroupStatsDailyRollup(
+                        date=stats["date"],
+                        campaign_id=stats["campaign_id"],
+                        device=stats["device"],
+                        impressions=stats["total_impressions"],
+                        clicks=stats["total_clicks"],
+                        conversions=stats["total_conversions"],
+                        cost=stats["total_cost"],
+                    )
+                    for stats in daily_stats
+                ]
+            )
+            refreshed += len(dates)
+
+
+def get_stats_queryset(start_date=None, end_date=None):
+    """
+    Return the daily rollup when it is up to date for the requested range and
+    the raw AdGroupStats rows otherwise. Both expose ``date``, ``device``,
+    ``campaign_id`` and the metric columns, so callers can aggregate either.
+    """
+    if settings.ANALYTICS_DAILY_ROLLUP:
+        dirty_dates = AdGroupStatsDirtyDate.objects.all()
+        if start_date:
+            dirty_dates = dirty_dates.filter(date__gte=start_date)
+        if end_date:
+            dirty_dates = dirty_dates.filter(date__lte=end_date)
+        if not dirty_dates.exists():
+            return AdGroupStatsDailyRollup.objects.all()
+
+    return AdGroupStats.objects.annotate(campaign_id=F("ad_group__campaign_id"))
@@ -1,8 +1,12 @@
 # myapp/serializers.py
+from functools import lru_cache
+from uuid import uuid4
+
 from django.contrib.auth.models import User
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
 
+from .cache import bump_data_version
 from .models import Campaign
 
 
@@ -22,7 +26,7 @@ class CampaignSerializer(serializers.ModelSerializer):
     id = serializers.IntegerField(read_only=True)
     name = serializers.CharField(read_only=False)
     campaign_type = serializers.CharField(read_only=True)
-    ad_groups_count = serializers.IntegerField(read_only=True)
+    ad_groups_count = serializers.IntegerField(source="ad_group_count", read_only=True)
     ad_group_names = serializers.ListField(
         child=serializers.CharField(), read_only=True
     )
@@ -34,6 +38,104 @@ class CampaignSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
 
 
+class CampaignBulkUpdateListSerializer(serializers.ListSerializer):
+    """
+    Validate campaign updates together against the campaigns of ``instance``
+    and apply them with one query. Errors are reported per item, in the order
+    of the items.
+    """
+
+    def to_internal_value(self, data):
+        try:
+            items = super().to_internal_value(data)
+            errors = [{} for _ in items]
+        except serializers.ValidationError as exc:
+            if not isinstance(exc.detail, list):
+                raise
+            errors = exc.detail
+            items = [
+                None if error else self.run_child_validation(item)
+                for item, error in zip(data, errors)
+            ]
+
+        valid_items = [item for item in items if item is not None]
+        campaigns = self.instance.in_bulk({item["id"] for item in valid_items})
+        seen_ids = set()
+        for index, item in enumerate(items):
+            if item is None:
+                continue
+            if item["id"] not in campaigns:
+                errors[index]["id"] = ["Campaign not found."]
+            elif item["id"] in seen_ids:
+                errors[index]["id"] = ["Campaign updated more than once."]
+            seen_ids.add(item["id"])
+
+        self.validate_unique_names(items, campaigns, errors)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+
+        for item in items:
+            item["campaign"] = campaigns[item["id"]]
+        return items
+
+    def validate_unique_names(self, items, campaigns, errors):
+        indexes = {}
+        for index, item in enumerate(items):
+            if errors[index]:
+                continue
+            key = (item["name"], campaigns[item["id"]].campaign_type)
+            if key in indexes:
+                errors[index]["name"] = ["Name used by another item."]
+            indexes[key] = index
+
+        taken = (
+            self.instance.exclude(id__in=campaigns)
+            .filter(name__in={name for name, _ in indexes})
+            .values_list("name", "campaign_type")
+        )
+        for key in taken:
+            if key in indexes:
+                errors[indexes[key]]["name"] = ["Name used by another campaign."]
+
+    def update(self, instance, validated_data):
+        """
+        Rename the campaigns. The unique constraint on name and campaign type
+        is checked row by row, so when a new name is still held by another
+        campaign of the batch, e.g. in a swap or a chain of renames, every
+        campaign first gets a temporary unique name.
+        """
+        campaigns = [item["campaign"] for item in validated_data]
+        held_names = {(campaign.name, campaign.campaign_type) for campaign in campaigns}
+        renames_to_held_name = any(
+            item["name"] != campaign.name
+            and (item["name"], campaign.campaign_type) in held_names
+            for item, campaign in zip(validated_data, campaigns)
+        )
+        try:
+            with transaction.atomic():
+                if renames_to_held_name:
+                    for campaign in campaigns:
+                        campaign.name = uuid4().hex
+                    instance.model.objects.bulk_update(campaigns, ["name"])
+                for item, campaign in zip(validated_data, campaigns):
+                    campaign.name = item["name"]
+                instance.model.objects.bulk_update(campaigns, ["name"])
+                bump_data_version()
+        except IntegrityError:
+            raise serializers.ValidationError(
+                {"non_field_errors": ["Names conflict with other campaigns."]}
+            )
+        return campaigns
+
+
+class CampaignBulkUpdateSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField(max_length=50)
+
+    class Meta:
+        list_serializer_class = CampaignBulkUpdateListSerializer
+
+
 class PerformanceTimeSeriesQuerySerializer(serializers.Serializer):
     aggregate_by = serializers.ChoiceField(
         choices=[("day", "day"), ("week", "week"), ("month", "month")]
@@ -41,6 +143,18 @@ class PerformanceTimeSeriesQuerySerializer(serializers.Serializer):
     campaigns = serializers.ListField(child=serializers.CharField(), required=False)
     start_date = serializers.DateField(required=False)
     end_date = serializers.DateField(required=False)
+    pagination = serializers.ChoiceField(
+        choices=[("offset", "offset"), ("cursor", "cursor")], default="offset"
+    )
+    engine = serializers.ChoiceField(
+        choices=[("sql", "sql"), ("numpy", "numpy")], default="sql"
+    )
+    group_by = serializers.ListField(
+        child=serializers.ChoiceField(
+            choices=[("campaign", "campaign"), ("device", "device")]
+        ),
+        required=False,
+    )
 
     def validate(self, data):
         start_date = data.get("start_date", None)
@@ -55,6 +169,39 @@ class PerformanceTimeSeriesQuerySerializer(serializers.Serializer):
         return data
 
 
+class PerformanceTimeSeriesExportQuerySerializer(PerformanceTimeSeriesQuerySerializer):
+    aggregate_by = serializers.ChoiceField(
+        choices=[("day", "day"), ("week", "week"), ("month", "month")],
+        required=False,
+    )
+    pagination = None
+    engine = None
+    group_by = None
+    source = serializers.ChoiceField(
+        choices=[("aggregated", "aggregated"), ("raw", "raw")], default="aggregated"
+    )
+    file_format = serializers.ChoiceField(
+        choices=[("csv", "csv"), ("ndjson", "ndjson")], default="csv"
+    )
+
+    def validate(self, data):
+        data = super().validate(data)
+        if data["source"] == "aggregated" and "aggregate_by" not in data:
+            raise serializers.ValidationError(
+                {"aggregate_by": "This field is required for aggregated exports."}
+            )
+        return data
+
+
+class AdGroupStatsExportQuerySerializer(PerformanceTimeSeriesQuerySerializer):
+    aggregate_by = None
+    pagination = None
+    engine = None
+    group_by = None
+    campaigns = serializers.ListField(child=serializers.IntegerField(), required=False)
+    ad_groups = serializers.ListField(child=serializers.IntegerField(), required=False)
+
+
 class PerformanceTimeSeriesMetricSerializer(serializers.Serializer):
     campaign_id = serializers.IntegerField(required=False)
     total_cost = serializers.FloatField()
@@ -66,11 +213,45 @@ class PerformanceTimeSeriesMetricSerializer(serializers.Serializer):
     average_conversion_rate = serializers.FloatField()
 
 
+@lru_cache
+def get_output_casts(serializer_class):
+    """
+    Return ``(name, cast, required)`` for every field of ``serializer_class``,
+    where ``cast`` turns a database value into its output representation.
+    """
+    casts = []
+    for name, field in serializer_class().fields.items():
+        if isinstance(field, serializers.IntegerField):
+            cast = int
+        elif isinstance(field, serializers.FloatField):
+            cast = float
+        else:
+            cast = field.to_representation
+        casts.append((name, cast, field.required))
+    return casts
+
+
+def serialize_output(serializer_class, row):
+    """
+    Return the values ``row`` in the schema of ``serializer_class`` without
+    running its input validation, for payloads built by the database. Null
+    values are kept and optional fields missing from the row are left out.
+    """
+    return {
+        name: None if row[name] is None else cast(row[name])
+        for name, cast, required in get_output_casts(serializer_class)
+        if required or name in row
+    }
+
+
 class PerformanceQuerySerializer(serializers.Serializer):
     start_date = serializers.DateField()
     end_date = serializers.DateField()
-    compare_mode = serializers.ChoiceField(
-        choices=[("preceding", "preceding"), ("previous_month", "previous_month")]
+    compare_mode = serializers.ListField(
+        child=serializers.ChoiceField(
+            choices=[("preceding", "preceding"), ("previous_month", "previous_month")]
+        ),
+        allow_empty=False,
     )
 
     def validate(self, data):
@@ -0,0 +1,102 @@
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from knox.models import get_token_model
+
+from .authentication import invalidate_auth_tokens
+from .cache import bump_data_version
+from .models import AdGroup, AdGroupStats, Campaign
+from .rollups import mark_dates_dirty
+from .summaries import mark_campaigns_dirty
+
+
+@receiver(pre_save, sender=AdGroupStats)
+def remember_previous_stats_date(sender, instance, **kwargs):
+    instance._previous_date = None
+    instance._previous_campaign_id = None
+    if instance.pk is not None:
+        instance._previous_date, instance._previous_campaign_id = (
+            AdGroupStats.objects.filter(pk=instance.pk)
+            .values_list("date", "ad_group__campaign_id")
+            .first()
+        ) or (None, None)
+
+
+@receiver(post_save, sender=AdGroupStats)
+def mark_saved_stats_date_dirty(sender, instance, **kwargs):
+    dates = [instance.date]
+    if getattr(instance, "_previous_date", None):
+        dates.append(instance._previous_date)
+    mark_dates_dirty(dates)
+
+
+@receiver(post_delete, sender=AdGroupStats)
+def mark_deleted_stats_date_dirty(sender, instance, **kwargs):
+    mark_dates_dirty([instance.date])
+
+
+@receiver(post_save, sender=AdGroup)
+def mark_ad_group_stats_dates_dirty(sender, instance, created, **kwargs):
+    if created or instance._previous_campaign_id == instance.campaign_id:
+        return
+    mark_dates_dirty(
+        AdGroupStats.objects.filter(ad_group=instance)
+        .values_list("date", flat=True)
+        .distinct()
+    )
+
+
+@receiver([post_save, post_delete], sender=AdGroupStats)
+def mark_stats_campaign_dirty(sender, instance, **kwargs):
+    mark_campaigns_dirty(
+        [
+            instance.ad_group.campaign_id,
+            getattr(instance, "_previous_campaign_id", None),
+        ]
+    )
+
+
+@receiver(pre_save, sender=AdGroup)
+def remember_previous_ad_group_campaign(sender, instance, **kwargs):
+    instance._previous_campaign_id = (
+        AdGroup.objects.filter(pk=instance.pk)
+        .values_list("campaign_id", flat=True)
+        .first()
+    )
+
+
+@receiver([post_save, post_delete], sender=AdGroup)
+def mark_ad_group_campaign_dirty(sender, instance, **kwargs):
+    mark_campaigns_dirty(
+        [instance.campaign_id, getattr(instance, "_previous_campaign_id", None)]
+    )
+
+
+@receiver(post_save, sender=Campaign)
+def mark_created_campaign_dirty(sender, instance, created, **kwargs):
+    if created:
+        mark_campaigns_dirty([instance.id])
+
+
+@receiver([post_save, post_delete], sender=Campaign)
+@receiver([post_save, post_delete], sender=AdGroup)
+@receiver([post_save, post_delete], sender=AdGroupStats)
+def invalidate_cached_responses(sender, **kwargs):
+    bump_data_version()
+
+
+@receiver(post_delete, sender=get_token_model())
+def invalidate_deleted_auth_token(sender, instance, **kwargs):
+    transaction.on_commit(partial(invalidate_auth_tokens, [instance.digest]))
+
+
+@receiver(post_save, sender=get_user_model())
+def invalidate_user_auth_tokens(sender, instance, created, **kwargs):
+    if created:
+        return
+    digests = list(instance.auth_token_set.values_list("digest", flat=True))
+    if digests:
+        transaction.on_commit(partial(invalidate_auth_tokens, digests))
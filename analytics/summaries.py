@@ -0,0 +1,59 @@
+from django.db import connection
+
+from .models import CampaignSummary, CampaignSummaryDirtyCampaign
+
+
+def mark_campaigns_dirty(campaign_ids):
+    """
+    Mark the summary of ``campaign_ids`` out of date. Marking a campaign
+    again moves its ``marked_at`` forward, so a running refresh keeps it dirty.
+    """
+    CampaignSummaryDirtyCampaign.objects.bulk_create(
+        [
+            CampaignSummaryDirtyCampaign(campaign_id=campaign_id)
+            for campaign_id in set(campaign_ids)
+            if campaign_id is not None
+        ],
+        update_conflicts=True,
+        unique_fields=["campaign_id"],
+        update_fields=["marked_at"],
+    )
+
+
+def refresh_campaign_summary():
+    """
+    Refresh the campaign summary materialized view without blocking its
+    readers, and return the number of dirty campaigns it brought up to date.
+
+    The dirty campaigns are read without locking them, so marking campaigns
+    never waits for the refresh. Only the marks read before the refresh are
+    cleared afterwards; campaigns marked again while it runs stay dirty.
+    """
+    dirty_campaigns = list(
+        CampaignSummaryDirtyCampaign.objects.values_list("campaign_id", "marked_at")
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "REFRESH MATERIALIZED VIEW CONCURRENTLY "
+            f'"{CampaignSummary._meta.db_table}"'
+        )
+        if dirty_campaigns:
+            campaign_ids, marked_ats = zip(*dirty_campaigns)
+            cursor.execute(
+                f'DELETE FROM "{CampaignSummaryDirtyCampaign._meta.db_table}" AS dirty '
+                "USING unnest(%s::bigint[], %s::timestamptz[]) "
+                "AS refreshed(campaign_id, marked_at) "
+                "WHERE dirty.campaign_id = refreshed.campaign_id "
+                "AND dirty.marked_at <= refreshed.marked_at",
+                [list(campaign_ids), list(marked_ats)],
+            )
+    return len(dirty_campaigns)
+
+
+def get_dirty_campaign_ids(campaign_ids):
+    """Return the ids among ``campaign_ids`` whose summary is out of date."""
+    return set(
+        CampaignSummaryDirtyCampaign.objects.filter(
+            campaign_id__in=campaign_ids
+        ).values_list("campaign_id", flat=True)
+    )
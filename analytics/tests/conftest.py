@@ -0,0 +1,15 @@
+import pytest
+from django.core.cache import cache
+
+from analytics.authentication import local_token_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    local_token_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def strict_query_budget(settings):
+    settings.ANALYTICS_QUERY_BUDGET_STRICT = True
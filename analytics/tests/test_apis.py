@@ -1,21 +1,56 @@
+import csv
+import gzip
+import json
+from datetime import date
+from io import BytesIO, StringIO
 from unittest.mock import patch
 from urllib.parse import urlencode
 
+import pyarrow.parquet as pq
+import pytest
 from django.conf import settings
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from knox.models import AuthToken
 from parameterized import parameterized
+from prometheus_client import REGISTRY
 from rest_framework.status import (
     HTTP_200_OK,
+    HTTP_204_NO_CONTENT,
+    HTTP_304_NOT_MODIFIED,
     HTTP_400_BAD_REQUEST,
     HTTP_401_UNAUTHORIZED,
+    HTTP_403_FORBIDDEN,
     HTTP_404_NOT_FOUND,
     HTTP_429_TOO_MANY_REQUESTS,
 )
 from rest_framework.test import APITestCase
 
-from analytics.models import Campaign
+from analytics.authentication import local_token_cache
+from analytics.cache import bump_data_version
+from analytics.middleware import QueryBudgetExceeded
+from analytics.models import AdGroupStats, Campaign
+from analytics.summaries import refresh_campaign_summary
 
-from .factories import AdGroupStatsFactory, CampaignFactory, TokenFactory
+from .factories import AdGroupStatsFactory, CampaignFactory, TokenFactory, UserFactory
+
+
+def approx_campaigns(campaigns):
+    """The summary and live averages may differ in the last digits."""
+    return [
+        {
+            **campaign,
+            "average_monthly_cost": pytest.approx(campaign["average_monthly_cost"]),
+            "average_cost_per_conversion": pytest.approx(
+                campaign["average_cost_per_conversion"]
+            ),
+        }
+        for campaign in campaigns
+    ]
 
 
 class CampaignListAPITestCase(APITestCase):
@@ -32,6 +67,131 @@ class CampaignListAPITestCase(APITestCase):
         assert response.status_code == HTTP_200_OK
         assert len(response.data.get("results")) == 10
 
+    def test_get_campaign_list_with_limit_and_offset(self):
+        expected_ids = list(
+            Campaign.objects.order_by("id").values_list("id", flat=True)[5:10]
+        )
+        response = self.client.get(f"{self.url}?{urlencode({'limit': 5, 'offset': 5})}")
+        assert response.status_code == HTTP_200_OK
+        assert response.data["count"] == Campaign.objects.count()
+        assert [result["id"] for result in response.data["results"]] == expected_ids
+
+    def test_get_campaign_list_query_count_independent_of_catalogue_size(self):
+        with self.assertNumQueries(6):
+            self.client.get(f"{self.url}?{urlencode({'limit': 2})}")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            AdGroupStatsFactory.create_batch(30)
+        with self.assertNumQueries(6):
+            response = self.client.get(f"{self.url}?{urlencode({'limit': 2})}")
+        assert len(response.data["results"]) == 2
+
+    @override_settings(ANALYTICS_RESPONSE_CACHE=False)
+    def test_get_campaign_list_from_campaign_summary(self):
+        url = f"{self.url}?{urlencode({'limit': 50})}"
+        with override_settings(ANALYTICS_CAMPAIGN_SUMMARY=False):
+            expected = self.client.get(url).data["results"]
+        refresh_campaign_summary()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        assert response.status_code == HTTP_200_OK
+        assert response.data["results"] == approx_campaigns(expected)
+        assert len(queries) == 5
+        assert "analytics_campaignsummary" in queries[-1]["sql"]
+        assert "analytics_adgroupstats" not in queries[-1]["sql"]
+
+    @override_settings(ANALYTICS_RESPONSE_CACHE=False)
+    def test_get_campaign_list_with_dirty_campaign_summary(self):
+        refresh_campaign_summary()
+        stats = AdGroupStatsFactory(ad_group__campaign=Campaign.objects.first())
+        with override_settings(ANALYTICS_CAMPAIGN_SUMMARY=False):
+            expected = self.client.get(self.url).data["results"]
+
+        response = self.client.get(self.url)
+        assert response.data["results"] == approx_campaigns(expected)
+        assert stats.ad_group.name in response.data["results"][0]["ad_group_names"]
+
+        refresh_campaign_summary()
+        assert self.client.get(self.url).data["results"] == approx_campaigns(expected)
+
+    def test_get_campaign_list_from_response_cache(self):
+        url = f"{self.url}?{urlencode({'limit': 2})}"
+        response = self.client.get(url)
+        assert response["X-Cache"] == "MISS"
+
+        with self.assertNumQueries(1):
+            cached_response = self.client.get(url)
+        assert cached_response["X-Cache"] == "HIT"
+        assert cached_response.data == response.data
+
+    def test_update_campaign_name_invalidates_response_cache(self):
+        url = f"{self.url}?{urlencode({'limit': 1})}"
+        target_campaign_id = self.client.get(url).data["results"][0]["id"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                self.url, {"id": target_campaign_id, "name": "Updated Name"}
+            )
+        response = self.client.get(url)
+        assert response["X-Cache"] == "MISS"
+        assert response.data["results"][0]["name"] == "Updated Name"
+
+    def test_get_campaign_list_not_modified(self):
+        response = self.client.get(self.url)
+        etag = response["ETag"]
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTP_304_NOT_MODIFIED
+        assert response["ETag"] == etag
+        assert not response.content
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=f"W/{etag}")
+        assert response.status_code == HTTP_304_NOT_MODIFIED
+
+    def test_data_version_bumped_by_another_process(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        # Another process, e.g. ingest_stats, has its own local memory cache.
+        with patch("analytics.cache.cache", LocMemCache("other-process", {})):
+            bump_data_version()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTP_200_OK
+        assert response["X-Cache"] == "MISS"
+        assert response["ETag"] != etag
+
+    @override_settings(
+        ANALYTICS_QUERY_BUDGETS={"campaigns": {"queries": 4, "time": 1000}}
+    )
+    def test_get_campaign_list_over_query_budget(self):
+        with self.assertRaisesMessage(QueryBudgetExceeded, "campaigns ran"):
+            self.client.get(self.url)
+
+    @override_settings(ANALYTICS_COMPRESSION_MIN_SIZE=0)
+    def test_get_campaign_list_compressed(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+        assert response["Content-Encoding"] == "gzip"
+        assert json.loads(gzip.decompress(response.content)) == json.loads(
+            self.client.get(self.url).content
+        )
+
+        response = self.client.get(
+            self.url, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        assert response.status_code == HTTP_304_NOT_MODIFIED
+
+    def test_get_campaign_list_modified_after_update(self):
+        etag = self.client.get(self.url)["ETag"]
+        target_campaign = Campaign.objects.first()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(self.url, {"id": target_campaign.id, "name": "Updated"})
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTP_200_OK
+        assert response["ETag"] != etag
+
     def test_update_campaign_name(self):
         target_campaign = Campaign.objects.first()
 
@@ -61,6 +221,96 @@ class CampaignListAPITestCase(APITestCase):
         target_campaign.refresh_from_db()
         assert target_campaign.name != update_name
 
+    def test_bulk_update_campaign_names(self):
+        campaigns = list(Campaign.objects.order_by("id")[:3])
+        data = [
+            {"id": campaign.id, "name": f"Renamed {index}"}
+            for index, campaign in enumerate(campaigns)
+        ]
+        with self.assertNumQueries(6):
+            response = self.client.patch(self.url, data, format="json")
+        assert response.status_code == HTTP_200_OK
+        assert [campaign["name"] for campaign in response.data] == [
+            "Renamed 0",
+            "Renamed 1",
+            "Renamed 2",
+        ]
+        assert list(
+            Campaign.objects.filter(id__in=[item["id"] for item in data])
+            .order_by("id")
+            .values_list("name", flat=True)
+        ) == ["Renamed 0", "Renamed 1", "Renamed 2"]
+
+    def test_bulk_update_invalidates_response_cache(self):
+        self.client.get(self.url)
+        target_campaign = Campaign.objects.order_by("id").first()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                self.url, [{"id": target_campaign.id, "name": "Renamed"}], format="json"
+            )
+        response = self.client.get(self.url)
+        assert response["X-Cache"] == "MISS"
+        assert response.data["results"][0]["name"] == "Renamed"
+
+    def test_bulk_update_reports_errors_per_item(self):
+        first, second, third = Campaign.objects.order_by("id")[:3]
+        CampaignFactory(name="Taken", campaign_type=third.campaign_type)
+        data = [
+            {"id": first.id, "name": "Renamed"},
+            {"id": Campaign.objects.order_by("id").last().id + 1, "name": "Renamed"},
+            {"id": first.id, "name": "Renamed again"},
+            {"id": second.id, "name": "x" * 51},
+        ]
+        response = self.client.patch(self.url, data, format="json")
+        assert response.status_code == HTTP_400_BAD_REQUEST
+        assert response.data[0] == {}
+        assert response.data[1]["id"] == ["Campaign not found."]
+        assert response.data[2]["id"] == ["Campaign updated more than once."]
+        assert "name" in response.data[3]
+
+        response = self.client.patch(
+            self.url,
+            [{"id": first.id, "name": "Renamed"}, {"id": third.id, "name": "Taken"}],
+            format="json",
+        )
+        assert response.status_code == HTTP_400_BAD_REQUEST
+        assert response.data == [{}, {"name": ["Name used by another campaign."]}]
+        first.refresh_from_db()
+        assert first.name != "Renamed"
+
+    def test_bulk_update_swapping_names(self):
+        first = CampaignFactory(name="First", campaign_type="SEARCH_STANDARD")
+        second = CampaignFactory(name="Second", campaign_type="SEARCH_STANDARD")
+        data = [
+            {"id": first.id, "name": "Second"},
+            {"id": second.id, "name": "First"},
+        ]
+        response = self.client.patch(self.url, data, format="json")
+        assert response.status_code == HTTP_200_OK
+        first.refresh_from_db()
+        second.refresh_from_db()
+        assert (first.name, second.name) == ("Second", "First")
+
+    def test_bulk_update_chain_of_renames(self):
+        first = CampaignFactory(name="First", campaign_type="SEARCH_STANDARD")
+        second = CampaignFactory(name="Second", campaign_type="SEARCH_STANDARD")
+        data = [
+            {"id": first.id, "name": "Second"},
+            {"id": second.id, "name": "Third"},
+        ]
+        with self.assertNumQueries(7):
+            response = self.client.patch(self.url, data, format="json")
+        assert response.status_code == HTTP_200_OK
+        assert [campaign["name"] for campaign in response.data] == ["Second", "Third"]
+        first.refresh_from_db()
+        second.refresh_from_db()
+        assert (first.name, second.name) == ("Second", "Third")
+
+    def test_bulk_update_with_empty_list(self):
+        response = self.client.patch(self.url, [], format="json")
+        assert response.status_code == HTTP_400_BAD_REQUEST
+
     @patch("rest_framework.throttling.UserRateThrottle.get_rate")
     def test_get_campaign_list_exceed_throttle_limit(self, mock_get_rate):
         mock_get_rate.return_value = self.throttle_rate
@@ -472,6 +722,232 @@ class PerformanceTimeSeriesAPITestCase(APITestCase):
         for response_metric, expected_metric in zipped_results:
             assert response_metric == expected_metric
 
+    def test_get_performance_time_series_with_cursor_pagination(self):
+        param = {"aggregate_by": "day", "pagination": "cursor", "limit": 2}
+        response = self.client.get(f"{self.url}?{urlencode(param)}")
+        assert response.status_code == HTTP_200_OK
+        assert len(response.data["results"]) == 2
+        assert response.data["previous"] is None
+        assert "cursor=" in response.data["next"]
+
+        response = self.client.get(response.data["next"])
+        assert response.status_code == HTTP_200_OK
+        results = [list(result.values()) for result in response.data["results"]]
+        assert results == [[200, 2, 2, 100, 100, 1, 1]]
+        assert response.data["next"] is None
+
+        response = self.client.get(response.data["previous"])
+        assert response.status_code == HTTP_200_OK
+        assert len(response.data["results"]) == 2
+
+    @parameterized.expand([("day"), ("week"), ("month")])
+    @override_settings(ANALYTICS_RESPONSE_CACHE=False)
+    def test_get_performance_time_series_from_daily_rollup(self, aggregate_by):
+        param = {
+            "aggregate_by": aggregate_by,
+            "campaigns": self.campaign_1.id,
+            "start_date": "2024-11-27",
+        }
+        url = f"{self.url}?{urlencode(param)}"
+        raw_response = self.client.get(url)
+
+        call_command("refresh_stats_rollup", stdout=StringIO())
+        with CaptureQueriesContext(connection) as queries:
+            rollup_response = self.client.get(url)
+
+        assert rollup_response.status_code == HTTP_200_OK
+        assert rollup_response.data["results"] == raw_response.data["results"]
+        assert "analytics_adgroupstatsdailyrollup" in queries[-1]["sql"]
+
+    def test_get_performance_time_series_cache_ignores_campaigns_order(self):
+        param = {"aggregate_by": "day"}
+        campaigns = [self.campaign_1.id, self.campaign_2.id]
+        response = self.client.get(
+            f"{self.url}?{urlencode({**param, 'campaigns': f'{campaigns[0]},{campaigns[1]}'})}"
+        )
+        assert response["X-Cache"] == "MISS"
+
+        cached_response = self.client.get(
+            f"{self.url}?{urlencode({**param, 'campaigns': f'{campaigns[1]},{campaigns[0]}'})}"
+        )
+        assert cached_response["X-Cache"] == "HIT"
+        assert cached_response.data == response.data
+
+    def test_get_performance_time_series_etag_depends_on_query(self):
+        day_url = f"{self.url}?{urlencode({'aggregate_by': 'day'})}"
+        month_url = f"{self.url}?{urlencode({'aggregate_by': 'month'})}"
+        etag = self.client.get(day_url)["ETag"]
+
+        response = self.client.get(day_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTP_304_NOT_MODIFIED
+        response = self.client.get(month_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTP_200_OK
+        assert response["ETag"] != etag
+
+    def test_get_performance_time_series_invalid_query_is_not_cached(self):
+        url = f"{self.url}?{urlencode({'aggregate_by': 'invalid'})}"
+        self.client.get(url)
+        response = self.client.get(url)
+        assert response.status_code == HTTP_400_BAD_REQUEST
+        assert "X-Cache" not in response
+        assert "ETag" not in response
+
+    def test_export_performance_time_series_as_csv(self):
+        param = {"aggregate_by": "month", "campaigns": self.campaign_1.id}
+        response = self.client.get(
+            f"{reverse('performance-time-series-export')}?{urlencode(param)}"
+        )
+        assert response.status_code == HTTP_200_OK
+        assert response.streaming
+        assert response["Content-Type"] == "text/csv"
+
+        rows = list(csv.DictReader(StringIO(b"".join(response).decode())))
+        assert [(row["time_granularity"], row["total_cost"]) for row in rows] == [
+            ("2024-11-01", "100.0"),
+            ("2024-12-01", "200.0"),
+        ]
+
+    def test_export_raw_stats_as_ndjson(self):
+        param = {
+            "source": "raw",
+            "file_format": "ndjson",
+            "campaigns": self.campaign_2.id,
+            "start_date": "2024-12-01",
+        }
+        response = self.client.get(
+            f"{reverse('performance-time-series-export')}?{urlencode(param)}"
+        )
+        assert response.status_code == HTTP_200_OK
+        assert response["Content-Type"] == "application/x-ndjson"
+
+        rows = [json.loads(line) for line in b"".join(response).splitlines()]
+        assert [row["date"] for row in rows] == ["2024-12-02", "2024-12-04"]
+        assert {row["campaign_id"] for row in rows} == {self.campaign_2.id}
+        assert rows[0]["cost"] == 100
+
+    def test_export_ad_group_stats_as_parquet(self):
+        param = {"campaigns": self.campaign_1.id, "end_date": "2024-12-03"}
+        response = self.client.get(
+            f"{reverse('ad-group-stats-parquet')}?{urlencode(param)}"
+        )
+        assert response.status_code == HTTP_200_OK
+        assert response["Content-Type"] == "application/vnd.apache.parquet"
+
+        parquet_file = pq.ParquetFile(BytesIO(b"".join(response)))
+        assert parquet_file.metadata.num_row_groups == 2
+        table = parquet_file.read()
+        assert table.column("date").to_pylist() == [
+            date(2024, 11, 27),
+            date(2024, 12, 2),
+        ]
+        assert set(table.column("campaign_id").to_pylist()) == {self.campaign_1.id}
+
+    def test_export_ad_group_stats_as_parquet_with_invalid_ad_groups(self):
+        response = self.client.get(
+            f"{reverse('ad-group-stats-parquet')}?{urlencode({'ad_groups': 'a'})}"
+        )
+        assert response.status_code == HTTP_400_BAD_REQUEST
+
+    def test_export_performance_time_series_without_aggregate_by(self):
+        response = self.client.get(reverse("performance-time-series-export"))
+        assert response.status_code == HTTP_400_BAD_REQUEST
+        assert "aggregate_by" in response.data
+
+    @parameterized.expand([("day"), ("week"), ("month")])
+    def test_get_performance_time_series_with_numpy_engine(self, aggregate_by):
+        AdGroupStatsFactory(
+            date="2025-01-15",
+            cost=50,
+            ad_group__campaign_id=self.campaign_1.id,
+            conversions=0,
+            clicks=0,
+            impressions=0,
+        )
+        param = {"aggregate_by": aggregate_by, "limit": 100}
+        sql_response = self.client.get(f"{self.url}?{urlencode(param)}")
+        numpy_response = self.client.get(
+            f"{self.url}?{urlencode({**param, 'engine': 'numpy'})}"
+        )
+
+        assert numpy_response.status_code == HTTP_200_OK
+        assert numpy_response.data == sql_response.data
+        assert numpy_response.data["results"][-1]["average_cost_per_click"] == 0
+
+    def test_get_performance_time_series_with_numpy_engine_and_cursor(self):
+        param = {"aggregate_by": "day", "pagination": "cursor", "engine": "numpy"}
+        response = self.client.get(f"{self.url}?{urlencode({**param, 'limit': 2})}")
+        assert response.status_code == HTTP_200_OK
+        assert len(response.data["results"]) == 2
+
+        response = self.client.get(response.data["next"])
+        assert [list(result.values()) for result in response.data["results"]] == [
+            [200, 2, 2, 100, 100, 1, 1]
+        ]
+
+    def test_get_performance_time_series_grouped_by_campaign(self):
+        param = {"aggregate_by": "day", "group_by": "campaign"}
+        with self.assertNumQueries(3):
+            response = self.client.get(f"{self.url}?{urlencode(param)}")
+
+        assert response.status_code == HTTP_200_OK
+        assert response.data["dimensions"] == ["campaign_id"]
+        series = response.data["series"]
+        assert [item["key"] for item in series] == [
+            [self.campaign_1.id],
+            [self.campaign_2.id],
+        ]
+        assert series[0]["time_granularity"] == [
+            date(2024, 11, 27),
+            date(2024, 12, 2),
+            date(2024, 12, 4),
+        ]
+        assert series[1]["total_cost"] == [100, 100, 100]
+        assert series[1]["average_click_through_rate"] == [1, 1, 1]
+
+    @parameterized.expand([("sql"), ("numpy")])
+    def test_get_performance_time_series_grouped_by_campaign_and_device(self, engine):
+        AdGroupStatsFactory(
+            date="2024-12-02",
+            cost=50,
+            ad_group__campaign_id=self.campaign_1.id,
+            device="MOBILE",
+        )
+        param = {
+            "aggregate_by": "month",
+            "group_by": "campaign,device",
+            "engine": engine,
+            "campaigns": self.campaign_1.id,
+            "start_date": "2024-12-01",
+        }
+        response = self.client.get(f"{self.url}?{urlencode(param)}")
+
+        assert response.status_code == HTTP_200_OK
+        assert response.data["dimensions"] == ["campaign_id", "device"]
+        expected = AdGroupStats.objects.filter(
+            ad_group__campaign_id=self.campaign_1.id, date__gte="2024-12-01"
+        )
+        costs = {}
+        for stats in expected:
+            costs[stats.device] = costs.get(stats.device, 0) + stats.cost
+        assert {
+            item["key"][1]: item["total_cost"] for item in response.data["series"]
+        } == {device: [cost] for device, cost in costs.items()}
+
+    def test_get_performance_time_series_with_invalid_group_by(self):
+        param = {"aggregate_by": "day", "group_by": "ad_group"}
+        response = self.client.get(f"{self.url}?{urlencode(param)}")
+        assert response.status_code == HTTP_400_BAD_REQUEST
+
+    def test_get_performance_time_series_with_invalid_engine(self):
+        param = {"aggregate_by": "day", "engine": "invalid"}
+        response = self.client.get(f"{self.url}?{urlencode(param)}")
+        assert response.status_code == HTTP_400_BAD_REQUEST
+
+    def test_get_performance_time_series_with_invalid_pagination(self):
+        param = {"aggregate_by": "day", "pagination": "invalid"}
+        response = self.client.get(f"{self.url}?{urlencode(param)}")
+        assert response.status_code == HTTP_400_BAD_REQUEST
+
     def test_get_performance_time_series_without_aggregate_by(self):
         response = self.client.get(self.url)
         assert response.status_code == HTTP_400_BAD_REQUEST
@@ -727,6 +1203,97 @@ class PerformanceComparisonAPITestCase(APITestCase):
         ):
             assert response_result == expected_result
 
+    def test_get_performance_comparison_with_multiple_compare_modes(self):
+        param = {
+            "compare_mode": "preceding,previous_month",
+            "start_date": "2024-12-02",
+            "end_date": "2024-12-27",
+        }
+        with self.assertNumQueries(3):
+            response = self.client.get(f"{self.url}?{urlencode(param)}")
+
+        assert response.status_code == HTTP_200_OK
+        assert response.data["base_total_cost"] == 400
+        assert response.data["compared_total_cost"] == 200
+        assert list(response.data["comparisons"]) == ["preceding", "previous_month"]
+        assert response.data["comparisons"]["preceding"]["compared_total_cost"] == 200
+        assert (
+            response.data["comparisons"]["previous_month"]["compared_total_clicks"] == 2
+        )
+
+    def test_get_performance_comparison_cached_per_compare_mode_order(self):
+        param = {"start_date": "2024-12-27", "end_date": "2024-12-28"}
+        responses = [
+            self.client.get(
+                f"{self.url}?{urlencode({**param, 'compare_mode': compare_mode})}"
+            )
+            for compare_mode in ["preceding,previous_month", "previous_month,preceding"]
+        ]
+
+        assert [response["X-Cache"] for response in responses] == ["MISS", "MISS"]
+        assert responses[0]["ETag"] != responses[1]["ETag"]
+        assert responses[0].data["compared_total_cost"] == (
+            responses[0].data["comparisons"]["preceding"]["compared_total_cost"]
+        )
+        assert responses[1].data["compared_total_cost"] == (
+            responses[1].data["comparisons"]["previous_month"]["compared_total_cost"]
+        )
+        assert (
+            responses[0].data["compared_total_cost"]
+            != responses[1].data["compared_total_cost"]
+        )
+
+    def test_get_performance_comparison_with_invalid_compare_mode_in_list(self):
+        param = {
+            "compare_mode": "preceding,invalid",
+            "start_date": "2024-12-05",
+            "end_date": "2024-12-07",
+        }
+        response = self.client.get(f"{self.url}?{urlencode(param)}")
+        assert response.status_code == HTTP_400_BAD_REQUEST
+
+    def test_get_performance_comparison_click_through_rate_is_fractional(self):
+        AdGroupStatsFactory(date="2023-01-01", clicks=1, impressions=4)
+        param = {
+            "compare_mode": "preceding",
+            "start_date": "2023-01-01",
+            "end_date": "2023-01-01",
+        }
+        response = self.client.get(f"{self.url}?{urlencode(param)}")
+        assert response.status_code == HTTP_200_OK
+        assert response.data["base_click_through_rate"] == 0.25
+
+    def test_get_performance_comparison_not_modified(self):
+        param = {
+            "compare_mode": "preceding",
+            "start_date": "2024-12-05",
+            "end_date": "2024-12-07",
+        }
+        url = f"{self.url}?{urlencode(param)}"
+        etag = self.client.get(url)["ETag"]
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTP_304_NOT_MODIFIED
+
+    @override_settings(ANALYTICS_RESPONSE_CACHE=False)
+    def test_get_performance_comparison_data_from_daily_rollup(self):
+        param = {
+            "compare_mode": "previous_month",
+            "start_date": "2024-12-01",
+            "end_date": "2024-12-30",
+        }
+        url = f"{self.url}?{urlencode(param)}"
+        raw_response = self.client.get(url)
+
+        call_command("refresh_stats_rollup", stdout=StringIO())
+        with CaptureQueriesContext(connection) as queries:
+            rollup_response = self.client.get(url)
+
+        assert rollup_response.status_code == HTTP_200_OK
+        assert rollup_response.data == raw_response.data
+        assert "analytics_adgroupstatsdailyrollup" in queries[-1]["sql"]
+
     def test_get_performance_comparison_without_auth(self):
         param = {
             "compare_mode": "preceding",
@@ -800,3 +1367,187 @@ class PerformanceComparisonAPITestCase(APITestCase):
             url,
         )
         assert response.status_code == HTTP_429_TOO_MANY_REQUESTS
+
+
+class ResponseCacheStatsAPITestCase(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("response-cache-stats")
+        self.client.force_authenticate(user=UserFactory(is_staff=True))
+
+    def test_get_response_cache_stats(self):
+        campaigns_url = reverse("campaigns")
+        for _ in range(3):
+            self.client.get(campaigns_url)
+
+        response = self.client.get(self.url)
+        assert response.status_code == HTTP_200_OK
+        assert response.data["CampaignsListCreate"] == {"hit": 2, "miss": 1}
+        assert response.data["PerformanceComparisonRetrieve"] == {"hit": 0, "miss": 0}
+
+    def test_get_response_cache_stats_without_admin(self):
+        self.client.force_authenticate(user=UserFactory())
+        response = self.client.get(self.url)
+        assert response.status_code == HTTP_403_FORBIDDEN
+
+
+class MetricsAPITestCase(APITestCase):
+    def setUp(self):
+        super().setUp()
+        AdGroupStatsFactory.create_batch(3)
+        self.url = reverse("metrics")
+        self.campaigns_url = reverse("campaigns")
+        self.client.force_authenticate(user=TokenFactory().user)
+
+    def get_sample_value(self, name, **labels):
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    def test_get_metrics(self):
+        requests = self.get_sample_value(
+            "analytics_requests_total", route="campaigns", method="GET", status="200"
+        )
+        durations = self.get_sample_value(
+            "analytics_request_duration_seconds_count", route="campaigns"
+        )
+        hits = self.get_sample_value(
+            "analytics_response_cache_requests_total",
+            view="CampaignsListCreate",
+            outcome="hit",
+        )
+        for _ in range(2):
+            self.client.get(self.campaigns_url)
+
+        assert (
+            self.get_sample_value(
+                "analytics_requests_total",
+                route="campaigns",
+                method="GET",
+                status="200",
+            )
+            == requests + 2
+        )
+        assert (
+            self.get_sample_value(
+                "analytics_request_duration_seconds_count", route="campaigns"
+            )
+            == durations + 2
+        )
+        assert (
+            self.get_sample_value(
+                "analytics_response_cache_requests_total",
+                view="CampaignsListCreate",
+                outcome="hit",
+            )
+            == hits + 1
+        )
+
+        self.client.force_authenticate(user=UserFactory(is_staff=True))
+        response = self.client.get(self.url)
+        assert response.status_code == HTTP_200_OK
+        assert response["Content-Type"].startswith("text/plain")
+        content = response.content.decode()
+        assert (
+            'analytics_request_db_duration_seconds_count{route="campaigns"}' in content
+        )
+        assert (
+            'analytics_request_serialization_duration_seconds_count{route="campaigns"}'
+            in content
+        )
+
+    @patch("rest_framework.throttling.UserRateThrottle.get_rate")
+    def test_get_metrics_rejected_requests(self, mock_get_rate):
+        mock_get_rate.return_value = "1/min"
+        throttled = self.get_sample_value(
+            "analytics_throttled_requests_total", route="campaigns"
+        )
+        failures = self.get_sample_value(
+            "analytics_authentication_failures_total", route="campaigns"
+        )
+        for _ in range(2):
+            self.client.get(self.campaigns_url)
+        self.client.force_authenticate(user=None)
+        self.client.get(self.campaigns_url)
+
+        assert (
+            self.get_sample_value(
+                "analytics_throttled_requests_total", route="campaigns"
+            )
+            == throttled + 1
+        )
+        assert (
+            self.get_sample_value(
+                "analytics_authentication_failures_total", route="campaigns"
+            )
+            == failures + 1
+        )
+
+    def test_get_metrics_without_token_requires_staff(self):
+        assert self.client.get(self.url).status_code == HTTP_403_FORBIDDEN
+        self.client.force_authenticate(user=None)
+        assert self.client.get(self.url).status_code == HTTP_401_UNAUTHORIZED
+
+        with override_settings(ANALYTICS_METRICS_TOKEN=""):
+            response = self.client.get(self.url, HTTP_AUTHORIZATION="Bearer ")
+        assert response.status_code == HTTP_401_UNAUTHORIZED
+
+    @override_settings(ANALYTICS_METRICS_TOKEN="secret")
+    def test_get_metrics_with_token(self):
+        self.client.force_authenticate(user=None)
+        assert self.client.get(self.url).status_code == HTTP_401_UNAUTHORIZED
+        response = self.client.get(self.url, HTTP_AUTHORIZATION="Bearer wrong")
+        assert response.status_code == HTTP_401_UNAUTHORIZED
+
+        response = self.client.get(self.url, HTTP_AUTHORIZATION="Bearer secret")
+        assert response.status_code == HTTP_200_OK
+
+
+class CachedTokenAuthenticationAPITestCase(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = UserFactory()
+        _, token = AuthToken.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+        self.url = reverse("campaigns")
+
+    def test_warm_request_makes_no_auth_query(self):
+        assert self.client.get(self.url).status_code == HTTP_200_OK
+
+        # Only the data version of the cached response is read.
+        with self.assertNumQueries(1):
+            assert self.client.get(self.url).status_code == HTTP_200_OK
+
+    def test_shared_cache_used_when_local_cache_is_cold(self):
+        self.client.get(self.url)
+        local_token_cache.clear()
+
+        with self.assertNumQueries(1):
+            assert self.client.get(self.url).status_code == HTTP_200_OK
+
+    def test_invalid_token(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Token invalid")
+        assert self.client.get(self.url).status_code == HTTP_401_UNAUTHORIZED
+
+    def test_logout_invalidates_cached_token(self):
+        self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse("logout"))
+        assert response.status_code == HTTP_204_NO_CONTENT
+        assert not AuthToken.objects.exists()
+        assert self.client.get(self.url).status_code == HTTP_401_UNAUTHORIZED
+
+    def test_deactivating_user_invalidates_cached_token(self):
+        self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        assert self.client.get(self.url).status_code == HTTP_401_UNAUTHORIZED
+
+    @override_settings(ANALYTICS_AUTH_TOKEN_CACHE_TIMEOUT=0)
+    def test_token_not_cached_without_timeout(self):
+        self.client.get(self.url)
+
+        with CaptureQueriesContext(connection) as queries:
+            assert self.client.get(self.url).status_code == HTTP_200_OK
+        assert any("knox_authtoken" in query["sql"] for query in queries)
@@ -0,0 +1,139 @@
+from urllib.parse import urlencode
+
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.status import (
+    HTTP_200_OK,
+    HTTP_400_BAD_REQUEST,
+    HTTP_401_UNAUTHORIZED,
+    HTTP_405_METHOD_NOT_ALLOWED,
+)
+from rest_framework.test import APITransactionTestCase
+
+from analytics.async_views import AsyncCampaignsList, run_concurrently
+from analytics.middleware import QueryRecorder
+from analytics.models import AdGroupStats, Campaign
+from analytics.summaries import refresh_campaign_summary
+
+from .factories import AdGroupStatsFactory, CampaignFactory, TokenFactory
+
+
+class AsyncCampaignListAPITestCase(APITransactionTestCase):
+    def setUp(self):
+        super().setUp()
+        AdGroupStatsFactory.create_batch(15)
+        token = TokenFactory()
+        self.client.force_authenticate(user=token.user)
+        self.url = reverse("async-campaigns")
+
+    def test_async_view_is_coroutine(self):
+        assert AsyncCampaignsList.view_is_async
+
+    def test_get_async_campaign_list_matches_sync(self):
+        param = {"limit": 5, "offset": 5}
+        response = self.client.get(f"{self.url}?{urlencode(param)}")
+        sync_response = self.client.get(f"{reverse('campaigns')}?{urlencode(param)}")
+
+        assert response.status_code == HTTP_200_OK
+        assert response.data["count"] == Campaign.objects.count()
+        assert response.data["results"] == sync_response.data["results"]
+        assert response.data["next"].startswith("http://testserver/")
+
+    def test_get_async_campaign_list_from_campaign_summary(self):
+        refresh_campaign_summary()
+        # A queryset update sends no signal, so the summary is left stale.
+        AdGroupStats.objects.update(cost=100)
+
+        results = self.client.get(self.url).data["results"]
+        assert results == self.client.get(reverse("campaigns")).data["results"]
+        with override_settings(ANALYTICS_CAMPAIGN_SUMMARY=False):
+            assert results != self.client.get(self.url).data["results"]
+
+    def test_update_async_campaign_list_not_allowed(self):
+        response = self.client.patch(self.url, {"id": 1, "name": "Updated"})
+        assert response.status_code == HTTP_405_METHOD_NOT_ALLOWED
+
+    def test_get_async_campaign_list_without_auth(self):
+        self.client.force_authenticate(user=None)
+        response = self.client.get(self.url)
+        assert response.status_code == HTTP_401_UNAUTHORIZED
+
+
+class AsyncPerformanceComparisonAPITestCase(APITransactionTestCase):
+    def setUp(self):
+        super().setUp()
+        campaign = CampaignFactory()
+        for stats_date, cost in [
+            ("2024-11-05", 50),
+            ("2024-11-28", 100),
+            ("2024-12-05", 200),
+        ]:
+            AdGroupStatsFactory(
+                date=stats_date,
+                cost=cost,
+                ad_group__campaign_id=campaign.id,
+                conversions=1,
+                clicks=4,
+                impressions=16,
+            )
+        token = TokenFactory()
+        self.client.force_authenticate(user=token.user)
+        self.url = reverse("async-performance-comparison")
+
+    def test_get_async_performance_comparison_matches_sync(self):
+        param = {
+            "compare_mode": "preceding,previous_month",
+            "start_date": "2024-12-01",
+            "end_date": "2024-12-07",
+        }
+        response = self.client.get(f"{self.url}?{urlencode(param)}")
+        sync_response = self.client.get(
+            f"{reverse('performance-comparison')}?{urlencode(param)}"
+        )
+
+        assert response.status_code == HTTP_200_OK
+        assert response.data == sync_response.data
+        assert response.data["base_total_cost"] == 200
+        assert response.data["comparisons"]["preceding"]["compared_total_cost"] == 100
+        assert response.data["comparisons"]["previous_month"] == {
+            **response.data["comparisons"]["previous_month"],
+            "compared_total_cost": 50,
+        }
+
+    def test_get_async_performance_comparison_with_invalid_compare_mode(self):
+        param = {
+            "compare_mode": "invalid",
+            "start_date": "2024-12-01",
+            "end_date": "2024-12-07",
+        }
+        response = self.client.get(f"{self.url}?{urlencode(param)}")
+        assert response.status_code == HTTP_400_BAD_REQUEST
+
+
+class RunConcurrentlyTestCase(APITransactionTestCase):
+    async def test_run_concurrently_uses_separate_connections(self):
+        def get_backend_pid():
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_sleep(0.2), pg_backend_pid()")
+                return cursor.fetchone()[1]
+
+        backend_pids = await run_concurrently(get_backend_pid, get_backend_pid)
+        assert len(set(backend_pids)) == 2
+
+    async def test_run_concurrently_closes_connections(self):
+        def get_connection():
+            connection.ensure_connection()
+            return connection
+
+        used_connections = await run_concurrently(get_connection, get_connection)
+        assert all(used.connection is None for used in used_connections)
+
+    async def test_run_concurrently_records_queries(self):
+        def select_one():
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+
+        recorder = QueryRecorder()
+        await run_concurrently(select_one, select_one, recorder=recorder)
+        assert recorder.count == 2
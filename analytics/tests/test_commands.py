@@ -0,0 +1,447 @@
+import threading
+from datetime import date
+from io import StringIO
+from tempfile import NamedTemporaryFile, TemporaryDirectory
+from urllib.parse import urlencode
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from dateutil.relativedelta import relativedelta
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from analytics.cache import get_data_version
+from analytics.models import (
+    AdGroupStats,
+    AdGroupStatsDailyRollup,
+    AdGroupStatsDirtyDate,
+    CampaignSummary,
+    CampaignSummaryDirtyCampaign,
+)
+from analytics.partitions import (
+    create_monthly_partition,
+    detach_monthly_partition,
+    get_monthly_partitions,
+)
+from analytics.rollups import refresh_daily_rollup
+from analytics.summaries import mark_campaigns_dirty, refresh_campaign_summary
+
+from .factories import (
+    AdGroupFactory,
+    AdGroupStatsFactory,
+    CampaignFactory,
+    TokenFactory,
+)
+
+
+class RefreshStatsRollupCommandTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.ad_group = AdGroupFactory()
+        self.stats = [
+            AdGroupStatsFactory(
+                date="2024-12-01",
+                ad_group=ad_group,
+                device="MOBILE",
+                impressions=10,
+                clicks=2,
+                conversions=1,
+                cost=100,
+            )
+            for ad_group in [
+                self.ad_group,
+                AdGroupFactory(campaign=self.ad_group.campaign),
+            ]
+        ]
+
+    def refresh(self):
+        out = StringIO()
+        call_command("refresh_stats_rollup", stdout=out)
+        return out.getvalue()
+
+    def test_refresh_stats_rollup(self):
+        assert AdGroupStatsDirtyDate.objects.count() == 1
+        assert "1 dates refreshed" in self.refresh()
+
+        rollup = AdGroupStatsDailyRollup.objects.get()
+        assert str(rollup.date) == "2024-12-01"
+        assert rollup.campaign_id == self.ad_group.campaign_id
+        assert rollup.device == "MOBILE"
+        assert (rollup.impressions, rollup.clicks) == (20, 4)
+        assert (rollup.conversions, rollup.cost) == (2, 200)
+        assert not AdGroupStatsDirtyDate.objects.exists()
+
+    def test_refresh_stats_rollup_only_processes_dirty_dates(self):
+        self.refresh()
+        assert "0 dates refreshed" in self.refresh()
+
+        self.stats[0].cost = 50
+        self.stats[0].save()
+        assert "1 dates refreshed" in self.refresh()
+        assert AdGroupStatsDailyRollup.objects.get().cost == 150
+
+    def test_refresh_stats_rollup_after_stats_date_changed(self):
+        self.refresh()
+        self.stats[0].date = "2024-12-02"
+        self.stats[0].save()
+        assert "2 dates refreshed" in self.refresh()
+        assert AdGroupStatsDailyRollup.objects.count() == 2
+
+    def test_refresh_stats_rollup_after_ad_group_moved_campaign(self):
+        self.refresh()
+        self.ad_group.campaign = CampaignFactory()
+        self.ad_group.save()
+        self.refresh()
+        rollup = AdGroupStatsDailyRollup.objects.get(
+            campaign_id=self.ad_group.campaign_id
+        )
+        assert (rollup.impressions, rollup.cost) == (10, 100)
+
+    def test_ad_group_rename_does_not_mark_dates_dirty(self):
+        self.refresh()
+        self.ad_group.name = "Renamed"
+        self.ad_group.save()
+        assert not AdGroupStatsDirtyDate.objects.exists()
+
+
+class RefreshStatsRollupConcurrencyTestCase(TransactionTestCase):
+    def test_stats_written_during_refresh_stay_dirty(self):
+        ad_group = AdGroupFactory()
+        AdGroupStatsFactory(
+            date="2024-12-01", ad_group=ad_group, device="MOBILE", cost=100
+        )
+
+        def write_stats():
+            try:
+                AdGroupStatsFactory(
+                    date="2024-12-01", ad_group=ad_group, device="DESKTOP", cost=50
+                )
+            finally:
+                connection.close()
+
+        writer = threading.Thread(target=write_stats)
+
+        def write_after_aggregation(execute, sql, params, many, context):
+            result = execute(sql, params, many, context)
+            if writer.ident is None and '"analytics_adgroupstats"' in sql:
+                writer.start()
+                # The writer finishes at once when its dirty mark is ignored,
+                # and waits for the refresh to commit otherwise.
+                writer.join(timeout=0.5)
+            return result
+
+        with connection.execute_wrapper(write_after_aggregation):
+            refresh_daily_rollup()
+        writer.join()
+
+        refresh_daily_rollup()
+        assert AdGroupStatsDailyRollup.objects.get(device="DESKTOP").cost == 50
+
+
+class RefreshCampaignSummaryCommandTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.ad_group = AdGroupFactory()
+        for month, cost in [(1, 100), (1, 50), (2, 30)]:
+            AdGroupStatsFactory(
+                date=date(2024, month, 1 + int(cost == 50)),
+                ad_group=self.ad_group,
+                cost=cost,
+                conversions=2,
+            )
+
+    def refresh(self):
+        out = StringIO()
+        call_command("refresh_campaign_summary", stdout=out)
+        return out.getvalue()
+
+    def test_refresh_campaign_summary(self):
+        assert "1 dirty campaigns refreshed" in self.refresh()
+        assert not CampaignSummaryDirtyCampaign.objects.exists()
+
+        summary = CampaignSummary.objects.get(campaign_id=self.ad_group.campaign_id)
+        assert summary.ad_group_count == 1
+        assert summary.ad_group_names == [self.ad_group.name]
+        assert summary.average_monthly_cost == 90
+        assert summary.average_cost_per_conversion == 30
+
+    def test_refresh_campaign_summary_after_ad_group_moved_campaign(self):
+        self.refresh()
+        previous_campaign_id = self.ad_group.campaign_id
+        self.ad_group.campaign = CampaignFactory()
+        self.ad_group.save()
+        assert set(
+            CampaignSummaryDirtyCampaign.objects.values_list("campaign_id", flat=True)
+        ) == {previous_campaign_id, self.ad_group.campaign_id}
+
+        assert "2 dirty campaigns refreshed" in self.refresh()
+        summary = CampaignSummary.objects.get(campaign_id=previous_campaign_id)
+        assert (summary.ad_group_count, summary.average_monthly_cost) == (0, None)
+        summary = CampaignSummary.objects.get(campaign_id=self.ad_group.campaign_id)
+        assert summary.average_monthly_cost == 90
+
+    def test_campaign_marked_during_refresh_stays_dirty(self):
+        campaign_id = self.ad_group.campaign_id
+
+        def mark_during_refresh(execute, sql, params, many, context):
+            if sql.startswith("REFRESH MATERIALIZED VIEW"):
+                mark_campaigns_dirty([campaign_id])
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(mark_during_refresh):
+            assert "1 dirty campaigns refreshed" in self.refresh()
+        assert list(
+            CampaignSummaryDirtyCampaign.objects.values_list("campaign_id", flat=True)
+        ) == [campaign_id]
+
+        assert "1 dirty campaigns refreshed" in self.refresh()
+        assert not CampaignSummaryDirtyCampaign.objects.exists()
+
+
+class ManageStatsPartitionsCommandTestCase(TestCase):
+    def get_partition_of(self, stats):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT tableoid::regclass::text FROM analytics_adgroupstats "
+                "WHERE id = %s",
+                [stats.id],
+            )
+            return cursor.fetchone()[0]
+
+    def test_create_partitions_ahead(self):
+        call_command("manage_stats_partitions", months_ahead=6, stdout=StringIO())
+        next_months = [
+            timezone.now().date().replace(day=1) + relativedelta(months=offset)
+            for offset in range(7)
+        ]
+        assert set(next_months) <= set(get_monthly_partitions())
+
+    def test_backfill_moves_rows_out_of_default_partition(self):
+        stats = AdGroupStatsFactory(date="2001-05-10")
+        assert self.get_partition_of(stats) == "analytics_adgroupstats_default"
+
+        call_command("manage_stats_partitions", backfill=True, stdout=StringIO())
+        assert self.get_partition_of(stats) == "analytics_adgroupstats_200105"
+        assert AdGroupStats.objects.filter(date="2001-05-10").count() == 1
+
+    def test_detach_partitions_older_than_retention(self):
+        AdGroupStatsFactory(date="2001-05-10")
+        call_command(
+            "manage_stats_partitions",
+            backfill=True,
+            retain_months=12,
+            stdout=StringIO(),
+        )
+        assert date(2001, 5, 1) not in get_monthly_partitions()
+        assert not AdGroupStats.objects.filter(date="2001-05-10").exists()
+
+    def test_create_partition_of_detached_month(self):
+        create_monthly_partition(date(2001, 5, 1))
+        detached_name = detach_monthly_partition(date(2001, 5, 1))
+        assert detached_name.startswith("analytics_adgroupstats_200105_detached_")
+
+        assert create_monthly_partition(date(2001, 5, 1))
+        stats = AdGroupStatsFactory(date="2001-05-10")
+        assert self.get_partition_of(stats) == "analytics_adgroupstats_200105"
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [detached_name])
+            assert cursor.fetchone()[0]
+
+    def test_detached_month_no_longer_visible_to_apis(self):
+        create_monthly_partition(date(2001, 5, 1))
+        stats = AdGroupStatsFactory(date="2001-05-10", cost=42)
+        refresh_daily_rollup()
+        refresh_campaign_summary()
+        client = APIClient()
+        client.force_authenticate(user=TokenFactory().user)
+        url = f"{reverse('performance-time-series')}?" + urlencode(
+            {
+                "aggregate_by": "month",
+                "start_date": "2001-05-01",
+                "end_date": "2001-05-31",
+            }
+        )
+        assert client.get(url).data["results"][0]["total_cost"] == 42
+
+        detach_monthly_partition(date(2001, 5, 1))
+
+        response = client.get(url)
+        assert response["X-Cache"] == "MISS"
+        assert response.data["results"] == []
+        assert not AdGroupStatsDailyRollup.objects.filter(date="2001-05-10").exists()
+        assert CampaignSummaryDirtyCampaign.objects.filter(
+            campaign_id=stats.ad_group.campaign_id
+        ).exists()
+
+
+class IngestStatsCommandTestCase(TestCase):
+    header = (
+        "date,ad_group_id,ad_group_name,device,impressions,clicks,conversions,cost\n"
+    )
+
+    def setUp(self):
+        super().setUp()
+        self.ad_group = AdGroupFactory()
+        self.lines = [
+            f"2024-12-0{day},{self.ad_group.id},name,MOBILE,10,2,1.5,100.5\n"
+            for day in range(1, 6)
+        ]
+        self.file = NamedTemporaryFile("w", suffix=".csv", encoding="utf-8")
+        self.file.write(self.header + "".join(self.lines))
+        self.file.flush()
+        self.addCleanup(self.file.close)
+
+    def ingest(self, **options):
+        out = StringIO()
+        call_command("ingest_stats", self.file.name, stdout=out, **options)
+        return out.getvalue()
+
+    def test_ingest_stats(self):
+        output = self.ingest(batch_size=2)
+
+        assert "5 ad group stats added" in output
+        assert output.count("rows/sec") == 3
+        stats = AdGroupStats.objects.get(date="2024-12-03")
+        assert stats.ad_group_id == self.ad_group.id
+        assert (stats.device, stats.impressions, stats.clicks) == ("MOBILE", 10, 2)
+        assert (stats.conversions, stats.cost) == (1.5, 100.5)
+        assert AdGroupStatsDirtyDate.objects.count() == 5
+
+    def test_ingest_stats_refreshes_campaign_summary(self):
+        output = self.ingest()
+
+        assert "1 dirty campaigns refreshed" in output
+        assert not CampaignSummaryDirtyCampaign.objects.exists()
+        summary = CampaignSummary.objects.get(campaign_id=self.ad_group.campaign_id)
+        assert summary.average_monthly_cost == 502.5
+        assert summary.average_cost_per_conversion == 67
+
+    def test_ingest_stats_resume_from_offset(self):
+        offset = len(self.header) + len(self.lines[0]) + len(self.lines[1])
+        output = self.ingest(offset=offset)
+
+        assert "3 ad group stats added" in output
+        assert not AdGroupStats.objects.filter(
+            date__in=["2024-12-01", "2024-12-02"]
+        ).exists()
+
+    def test_ingest_stats_reports_offset_to_resume_from(self):
+        output = self.ingest(batch_size=2)
+        reported_offset = int(output.splitlines()[0].split("offset ")[1].split(",")[0])
+        assert reported_offset == len(self.header) + len(self.lines[0]) * 2
+
+    def test_ingest_stats_with_newline_in_quoted_value(self):
+        self.file.seek(0)
+        self.file.truncate()
+        first_line = (
+            f'2024-12-01,{self.ad_group.id},"first\nsécond",MOBILE,10,2,1,100\n'
+        )
+        self.file.write("\ufeff" + self.header + first_line + "".join(self.lines[1:]))
+        self.file.flush()
+
+        output = self.ingest(batch_size=2)
+
+        assert "5 ad group stats added" in output
+        assert AdGroupStats.objects.get(date="2024-12-01").cost == 100
+        reported_offset = int(output.splitlines()[0].split("offset ")[1].split(",")[0])
+        assert reported_offset == len(
+            ("\ufeff" + self.header + first_line + self.lines[1]).encode()
+        )
+
+        AdGroupStats.objects.all().delete()
+        assert "3 ad group stats added" in self.ingest(offset=reported_offset)
+
+    def test_ingest_stats_with_differently_written_keys_in_batch(self):
+        self.file.write(f"2024-12-3,0{self.ad_group.id},name,MOBILE,30,6,3,300\n")
+        self.file.flush()
+
+        output = self.ingest()
+
+        assert "6 ad group stats added" in output
+        assert AdGroupStats.objects.count() == 5
+        stats = AdGroupStats.objects.get(date="2024-12-03")
+        assert (stats.impressions, stats.cost) == (30, 300)
+        assert AdGroupStatsDirtyDate.objects.count() == 5
+
+    def test_ingest_stats_with_missing_columns(self):
+        self.file.seek(0)
+        self.file.truncate()
+        self.file.write("date,ad_group_id\n")
+        self.file.flush()
+        with self.assertRaisesMessage(CommandError, "Missing columns: device"):
+            self.ingest()
+
+    def test_ingest_stats_invalidates_response_cache(self):
+        data_version = get_data_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.ingest()
+        assert get_data_version() == data_version + 1
+
+    def test_ingest_stats_twice_overwrites_rows(self):
+        self.ingest()
+        self.file.write(f"2024-12-03,{self.ad_group.id},name,MOBILE,30,6,3,300\n")
+        self.file.flush()
+        AdGroupStatsDirtyDate.objects.all().delete()
+
+        output = self.ingest(batch_size=2)
+
+        assert "6 ad group stats added" in output
+        assert AdGroupStats.objects.count() == 5
+        stats = AdGroupStats.objects.get(date="2024-12-03")
+        assert (stats.impressions, stats.clicks) == (30, 6)
+        assert (stats.conversions, stats.cost) == (3, 300)
+        assert AdGroupStatsDirtyDate.objects.count() == 5
+
+
+class ExportStatsParquetCommandTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.ad_group = AdGroupFactory()
+        for stats_date in ["2024-11-29", "2024-11-30", "2024-12-01"]:
+            AdGroupStatsFactory(
+                date=stats_date,
+                ad_group=self.ad_group,
+                device="MOBILE",
+                impressions=10,
+                clicks=2,
+                conversions=1,
+                cost=100,
+            )
+        AdGroupStatsFactory(date="2024-11-29")
+        self.directory = TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def export(self, **options):
+        out = StringIO()
+        call_command("export_stats_parquet", self.directory.name, stdout=out, **options)
+        return out.getvalue()
+
+    def test_export_stats_parquet_partitioned_by_month(self):
+        output = self.export(campaigns=[self.ad_group.campaign_id], batch_size=1)
+
+        assert "2 rows written for 2024-11" in output
+        assert "1 rows written for 2024-12" in output
+        assert "3 ad group stats exported" in output
+        table = pq.read_table(
+            f"{self.directory.name}/month=2024-11/part-0.parquet",
+            columns=["date", "device", "cost"],
+        )
+        assert table.num_rows == 2
+        assert table.column("device").type == pa.dictionary(pa.int8(), pa.string())
+        assert table.column("device").to_pylist() == ["MOBILE", "MOBILE"]
+        assert table.column("cost").to_pylist() == [100, 100]
+
+    def test_export_stats_parquet_date_range(self):
+        output = self.export(start_date=date(2024, 11, 30))
+        assert "2 ad group stats exported" in output
+
+        table = pq.read_table(self.directory.name)
+        assert sorted(table.column("month").to_pylist()) == ["2024-11", "2024-12"]
+        self.ad_group.campaign.refresh_from_db()
+        assert table.column("campaign_type").to_pylist()[0] == (
+            self.ad_group.campaign.campaign_type
+        )
@@ -0,0 +1,138 @@
+import gzip
+from unittest import skipUnless
+
+from django.db import connection
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import resolve
+from parameterized import parameterized
+
+from analytics.middleware import (
+    CompressionMiddleware,
+    QueryBudgetExceeded,
+    QueryBudgetMiddleware,
+    brotli,
+    get_accepted_encoding,
+    zstandard,
+)
+
+CONTENT = b'{"ad_group_names": ["' + b'", "'.join([b"ad-group"] * 500) + b'"]}'
+
+
+@override_settings(
+    ANALYTICS_COMPRESSION_MIN_SIZE=1024,
+    ANALYTICS_COMPRESSION_ENCODINGS=["br", "zstd", "gzip"],
+)
+class CompressionMiddlewareTestCase(SimpleTestCase):
+    def get_response(self, response, accept_encoding="gzip"):
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_compress_with_gzip(self):
+        response = self.get_response(HttpResponse(CONTENT), "gzip, deflate")
+        assert response["Content-Encoding"] == "gzip"
+        assert response["Vary"] == "Accept-Encoding"
+        assert int(response["Content-Length"]) == len(response.content)
+        assert gzip.decompress(response.content) == CONTENT
+
+    def test_not_compressed_below_min_size(self):
+        response = self.get_response(HttpResponse(CONTENT[:1000]))
+        assert not response.has_header("Content-Encoding")
+        assert response.content == CONTENT[:1000]
+
+    def test_not_compressed_when_not_accepted(self):
+        response = self.get_response(HttpResponse(CONTENT), "gzip;q=0, identity")
+        assert not response.has_header("Content-Encoding")
+        assert response["Vary"] == "Accept-Encoding"
+
+    def test_not_compressed_for_compressed_content_type(self):
+        response = self.get_response(
+            StreamingHttpResponse(
+                [CONTENT], content_type="application/vnd.apache.parquet"
+            )
+        )
+        assert not response.has_header("Content-Encoding")
+
+    def test_compress_streaming_response(self):
+        response = self.get_response(StreamingHttpResponse([CONTENT] * 10))
+        assert response["Content-Encoding"] == "gzip"
+        assert not response.has_header("Content-Length")
+        assert gzip.decompress(b"".join(response.streaming_content)) == CONTENT * 10
+
+    def test_etag_made_weak(self):
+        response = HttpResponse(CONTENT)
+        response["ETag"] = '"abc"'
+        assert self.get_response(response)["ETag"] == 'W/"abc"'
+
+    @skipUnless(brotli, "brotli is not installed")
+    def test_compress_with_brotli(self):
+        response = self.get_response(HttpResponse(CONTENT), "gzip, br")
+        assert response["Content-Encoding"] == "br"
+        assert brotli.decompress(response.content) == CONTENT
+
+    @skipUnless(zstandard, "zstandard is not installed")
+    def test_compress_with_zstd(self):
+        response = self.get_response(StreamingHttpResponse([CONTENT] * 10), "zstd")
+        assert response["Content-Encoding"] == "zstd"
+        compressed = b"".join(response.streaming_content)
+        reader = zstandard.ZstdDecompressor().decompressobj()
+        assert reader.decompress(compressed) == CONTENT * 10
+
+    @parameterized.expand(
+        [
+            ("gzip, deflate, br", ["br", "gzip"], "br"),
+            ("gzip;q=1.0, br;q=0.5", ["br", "gzip"], "gzip"),
+            ("*", ["br", "gzip"], "br"),
+            ("br;q=0, *;q=0.1", ["br", "gzip"], "gzip"),
+            ("deflate", ["br", "gzip"], None),
+            ("", ["gzip"], None),
+        ]
+    )
+    def test_get_accepted_encoding(self, accept_encoding, encodings, expected):
+        assert get_accepted_encoding(accept_encoding, encodings) == expected
+
+
+@override_settings(ANALYTICS_QUERY_BUDGETS={"campaigns": {"queries": 2, "time": 1000}})
+class QueryBudgetMiddlewareTestCase(TestCase):
+    def get_response(self, queries, url="/analytics/api/v1/campaigns/"):
+        def view(request):
+            request.resolver_match = resolve(request.path)
+            with connection.cursor() as cursor:
+                for sql in queries:
+                    cursor.execute(sql)
+            return HttpResponse()
+
+        return QueryBudgetMiddleware(view)(RequestFactory().get(url))
+
+    def test_within_budget(self):
+        with self.assertNoLogs("analytics.middleware", "WARNING"):
+            response = self.get_response(["SELECT 1", "SELECT 2"])
+        assert response.status_code == 200
+
+    @override_settings(ANALYTICS_QUERY_BUDGET_STRICT=False)
+    def test_over_query_budget_logs_warning(self):
+        with self.assertLogs("analytics.middleware", "WARNING") as logs:
+            self.get_response(["SELECT 1", "SELECT pg_sleep(0.01)", "SELECT 3"])
+        assert "campaigns ran 3 queries" in logs.output[0]
+        assert "SELECT pg_sleep(0.01)" in logs.output[0]
+
+    @override_settings(
+        ANALYTICS_QUERY_BUDGET_STRICT=True,
+        ANALYTICS_QUERY_BUDGETS={"campaigns": {"time": 5}},
+    )
+    def test_over_time_budget_logs_warning_in_strict_mode(self):
+        with self.assertLogs("analytics.middleware", "WARNING") as logs:
+            response = self.get_response(["SELECT pg_sleep(0.01)"])
+        assert response.status_code == 200
+        assert "campaigns ran 1 queries" in logs.output[0]
+
+    @override_settings(ANALYTICS_QUERY_BUDGET_STRICT=True)
+    def test_over_query_budget_raises_in_strict_mode(self):
+        with self.assertRaisesMessage(QueryBudgetExceeded, "campaigns ran 3 queries"):
+            self.get_response(["SELECT 1", "SELECT 2", "SELECT 3"])
+
+    def test_view_without_budget(self):
+        response = self.get_response(
+            ["SELECT 1"] * 5, "/analytics/api/v1/performance-comparison/"
+        )
+        assert response.status_code == 200
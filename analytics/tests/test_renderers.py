@@ -0,0 +1,45 @@
+from datetime import date
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+
+from analytics.renderers import ORJSONRenderer
+
+
+class ORJSONRendererTestCase(SimpleTestCase):
+    def test_same_output_as_json_renderer(self):
+        data = {
+            "count": 2,
+            "results": [
+                {"time_granularity": date(2024, 12, 1), "total_cost": 100.5},
+                {"time_granularity": date(2025, 1, 1), "total_cost": 0.1 + 0.2},
+            ],
+            "detail": gettext_lazy("Invalid token."),
+            "amount": Decimal("1.50"),
+            "name": "café\u2028\u2029",
+        }
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    def test_float_notation(self):
+        assert ORJSONRenderer().render([0.00001]) == b"[0.00001]"
+        assert JSONRenderer().render([0.00001]) == b"[1e-05]"
+
+    def test_nan_and_infinity_written_as_null(self):
+        data = {"average_cost_per_conversion": float("nan"), "cost": float("inf")}
+        rendered = ORJSONRenderer().render(data)
+        assert rendered == b'{"average_cost_per_conversion":null,"cost":null}'
+        with self.assertRaises(ValueError):
+            JSONRenderer().render(data)
+
+    def test_non_str_keys(self):
+        assert ORJSONRenderer().render({1: "a"}) == b'{"1":"a"}'
+
+    def test_indent_falls_back_to_json_renderer(self):
+        data = {"results": [1, 2]}
+        rendered = ORJSONRenderer().render(data, "application/json; indent=4")
+        assert rendered == JSONRenderer().render(data, "application/json; indent=4")
+
+    def test_none(self):
+        assert ORJSONRenderer().render(None) == b""
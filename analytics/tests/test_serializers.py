@@ -0,0 +1,41 @@
+from django.test import SimpleTestCase
+
+from analytics.serializers import (
+    PerformanceMetricSerializer,
+    PerformanceTimeSeriesMetricSerializer,
+    serialize_output,
+)
+
+
+class SerializeOutputTestCase(SimpleTestCase):
+    def test_same_output_as_serializer(self):
+        row = {
+            "time_granularity": "2024-12-01",
+            "total_cost": 100,
+            "total_conversions": 4.5,
+            "total_clicks": 20,
+            "average_cost_per_click": 5,
+            "average_cost_per_conversion": 22.22,
+            "average_click_through_rate": 0.1,
+            "average_conversion_rate": 0.225,
+        }
+        serializer = PerformanceTimeSeriesMetricSerializer(data=row)
+        assert serializer.is_valid()
+
+        output = serialize_output(PerformanceTimeSeriesMetricSerializer, row)
+        assert output == serializer.data
+        assert list(output) == list(serializer.data)
+        assert isinstance(output["total_cost"], float)
+        assert "campaign_id" not in output
+
+        output = serialize_output(
+            PerformanceTimeSeriesMetricSerializer, {**row, "campaign_id": 3}
+        )
+        assert output["campaign_id"] == 3
+
+    def test_null_values_kept(self):
+        row = {field: None for field in PerformanceMetricSerializer().fields}
+        serializer = PerformanceMetricSerializer(data=row)
+        serializer.is_valid()
+
+        assert serialize_output(PerformanceMetricSerializer, row) == serializer.data
@@ -0,0 +1,91 @@
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from analytics.checks import check_shared_cache
+from analytics.throttling import SlidingWindowUserRateThrottle
+
+from .factories import UserFactory
+
+
+class SlidingWindowUserRateThrottleTestCase(SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.request = APIRequestFactory().get("/")
+        self.request.user = UserFactory.build(id=1)
+        force_authenticate(self.request, user=self.request.user)
+        self.now = 600.0
+        patcher = patch.object(
+            SlidingWindowUserRateThrottle, "timer", lambda throttle: self.now
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.object(
+            SlidingWindowUserRateThrottle, "get_rate", return_value="3/min"
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def allow_request(self):
+        throttle = SlidingWindowUserRateThrottle()
+        return throttle, throttle.allow_request(self.request, None)
+
+    def test_allow_request_up_to_rate(self):
+        assert [self.allow_request()[1] for _ in range(4)] == [True, True, True, False]
+
+    def test_rejected_requests_are_not_counted(self):
+        for _ in range(10):
+            self.allow_request()
+        throttle, allowed = self.allow_request()
+        assert not allowed
+        assert throttle.current_count == 3
+
+    def test_previous_window_weighted_by_overlap(self):
+        self.now = 650.0
+        for _ in range(3):
+            self.allow_request()
+
+        self.now = 670.0
+        throttle, allowed = self.allow_request()
+        assert not allowed
+        self.assertAlmostEqual(throttle.wait(), 10)
+
+        self.now = 690.0
+        throttle, allowed = self.allow_request()
+        assert allowed
+        self.assertAlmostEqual(throttle.get_request_count(), 2.5)
+
+    def test_wait_for_full_current_window(self):
+        for _ in range(3):
+            self.allow_request()
+        throttle, allowed = self.allow_request()
+        assert not allowed
+        self.assertAlmostEqual(throttle.wait(), 80)
+
+    def test_users_are_throttled_separately(self):
+        for _ in range(3):
+            self.allow_request()
+        self.request.user = UserFactory.build(id=2)
+        assert self.allow_request()[1]
+
+
+class SharedCacheCheckTestCase(SimpleTestCase):
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    )
+    def test_warn_for_local_memory_cache(self):
+        assert [warning.id for warning in check_shared_cache(None)] == [
+            "analytics.W001"
+        ]
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.redis.RedisCache",
+                "LOCATION": "redis://localhost:6379/0",
+            }
+        }
+    )
+    def test_shared_cache(self):
+        assert check_shared_cache(None) == []
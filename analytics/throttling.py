@@ -0,0 +1,72 @@
+from rest_framework.throttling import UserRateThrottle
+
+
+class SlidingWindowUserRateThrottle(UserRateThrottle):
+    """
+    UserRateThrottle counting the requests of the current and the previous
+    window in two cache counters. The previous window is weighted by the part
+    of it still inside the sliding window, so every request costs the same
+    few cache operations whatever the rate. Counters are incremented
+    atomically, so the limit holds across workers as long as they share the
+    cache through ``REDIS_URL``. With the default local memory cache every
+    process counts on its own, so gunicorn refuses to start several workers
+    without it and ``check --deploy`` warns about it.
+    """
+
+    def get_window_keys(self):
+        window = int(self.now // self.duration)
+        return f"{self.key}:{window}", f"{self.key}:{window - 1}"
+
+    def get_elapsed_fraction(self):
+        return (self.now % self.duration) / self.duration
+
+    def get_request_count(self):
+        """Return the requests in the sliding window ending now."""
+        return (
+            self.previous_count * (1 - self.get_elapsed_fraction()) + self.current_count
+        )
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        current_key, previous_key = self.get_window_keys()
+        self.cache.add(current_key, 0, 2 * self.duration)
+        try:
+            self.current_count = self.cache.incr(current_key)
+        except ValueError:
+            # The counter expired between add and incr.
+            self.cache.add(current_key, 1, 2 * self.duration)
+            self.current_count = 1
+        self.previous_count = self.cache.get(previous_key, 0)
+
+        if self.get_request_count() > self.num_requests:
+            # Rejected requests do not count against the limit.
+            self.cache.decr(current_key)
+            self.current_count -= 1
+            return self.throttle_failure()
+        return self.throttle_success()
+
+    def throttle_success(self):
+        return True
+
+    def wait(self):
+        """
+        Return the seconds until one more request fits in the sliding window,
+        assuming no other request is made meanwhile.
+        """
+        available = self.num_requests - self.current_count - 1
+        if self.previous_count and available >= 0:
+            fraction = 1 - available / self.previous_count
+            return max(fraction - self.get_elapsed_fraction(), 0) * self.duration
+
+        remaining = (1 - self.get_elapsed_fraction()) * self.duration
+        if not self.current_count:
+            return remaining
+        fraction = max(1 - (self.num_requests - 1) / self.current_count, 0)
+        return remaining + fraction * self.duration
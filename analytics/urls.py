@@ -1,6 +1,6 @@
 from django.urls import path
 
-from analytics import views
+from analytics import async_views, metrics, views
 
 urlpatterns = [
     path("api/v1/campaigns/", views.CampaignsListCreate.as_view(), name="campaigns"),
@@ -9,11 +9,38 @@ urlpatterns = [
         views.PerformanceTimeSeriesList.as_view(),
         name="performance-time-series",
     ),
+    path(
+        "api/v1/performance-time-series/export/",
+        views.PerformanceTimeSeriesExport.as_view(),
+        name="performance-time-series-export",
+    ),
+    path(
+        "api/v1/ad-group-stats/parquet/",
+        views.AdGroupStatsParquetExport.as_view(),
+        name="ad-group-stats-parquet",
+    ),
     path(
         "api/v1/performance-comparison/",
         views.PerformanceComparisonRetrieve.as_view(),
         name="performance-comparison",
     ),
+    path(
+        "api/v1/response-cache-stats/",
+        views.ResponseCacheStatsRetrieve.as_view(),
+        name="response-cache-stats",
+    ),
+    path("api/v1/metrics/", metrics.MetricsRetrieve.as_view(), name="metrics"),
+    path(
+        "api/v1/async/campaigns/",
+        async_views.AsyncCampaignsList.as_view(),
+        name="async-campaigns",
+    ),
+    path(
+        "api/v1/async/performance-comparison/",
+        async_views.AsyncPerformanceComparisonRetrieve.as_view(),
+        name="async-performance-comparison",
+    ),
     path("api/v1/register/", views.RegisterView.as_view(), name="register"),
     path("api/v1/login/", views.LoginView.as_view(), name="login"),
+    path("api/v1/logout/", views.LogoutView.as_view(), name="logout"),
 ]
@@ -1,62 +1,150 @@
+from functools import reduce
+from itertools import groupby
+from operator import or_
+
 from dateutil.relativedelta import relativedelta
+from django.conf import settings
 from django.contrib.auth import authenticate, login
 from django.contrib.postgres.aggregates import ArrayAgg
 from django.db.models import (
-    Avg,
     Case,
     Count,
     F,
     FloatField,
     OuterRef,
+    Q,
     Subquery,
     Sum,
     When,
 )
-from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
+from django.db.models.functions import Cast, TruncDay, TruncMonth, TruncWeek
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from knox.auth import TokenAuthentication
 from knox.views import LoginView as KnoxLoginView
+from knox.views import LogoutView as KnoxLogoutView
 from rest_framework.generics import ListAPIView, RetrieveAPIView, UpdateAPIView
 from rest_framework.pagination import LimitOffsetPagination
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.status import HTTP_400_BAD_REQUEST
 from rest_framework.views import APIView
 
+from .authentication import CachedTokenAuthentication
+from .cache import cache_response, conditional_response, get_response_cache_stats
+from .engines import compute_time_series_ratios
+from .exports import stream_rows
 from .models import AdGroupStats, Campaign
+from .pagination import TimeGranularityCursorPagination
+from .parquet import get_parquet_queryset, iter_parquet_file
+from .rollups import get_stats_queryset
 from .serializers import (
+    AdGroupStatsExportQuerySerializer,
+    CampaignBulkUpdateSerializer,
     CampaignSerializer,
+    ComparedPerformanceSerializer,
     LoginSerializer,
     PerformanceMetricSerializer,
     PerformanceQuerySerializer,
+    PerformanceTimeSeriesExportQuerySerializer,
     PerformanceTimeSeriesMetricSerializer,
     PerformanceTimeSeriesQuerySerializer,
     UserSerializer,
+    serialize_output,
 )
+from .summaries import get_dirty_campaign_ids
 
 
 class CampaignsListCreate(ListAPIView, UpdateAPIView):
     pagination_class = LimitOffsetPagination
     permission_classes = [IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
-
+    authentication_classes = [CachedTokenAuthentication]
+
+    bulk_update_max_length = 1000
+
+    campaign_values = [
+        "id",
+        "name",
+        "campaign_type",
+        "ad_group_count",
+        "ad_group_names",
+        "average_monthly_cost",
+        "average_cost_per_conversion",
+    ]
+
+    @conditional_response
+    @cache_response
     def list(self, request, *args, **kwargs):
+        campaign_ids = self.paginate_queryset(
+            Campaign.objects.order_by("id").values_list("id", flat=True)
+        )
+        serializer = CampaignSerializer(self.get_campaigns(campaign_ids), many=True)
+        return self.get_paginated_response(serializer.data)
+
+    def get_campaigns(self, campaign_ids):
+        """
+        Return the campaigns of ``campaign_ids`` ordered by id, reading the
+        aggregates of the clean ones from the campaign summary and computing
+        those of the dirty ones.
+        """
+        dirty_campaign_ids = (
+            get_dirty_campaign_ids(campaign_ids)
+            if settings.ANALYTICS_CAMPAIGN_SUMMARY
+            else set(campaign_ids)
+        )
+        summarized_campaign_ids = set(campaign_ids) - dirty_campaign_ids
+
+        campaigns = []
+        if summarized_campaign_ids:
+            campaigns += Campaign.objects.filter(id__in=summarized_campaign_ids).values(
+                "id", "name", "campaign_type", **self.get_campaign_summary_fields()
+            )
+        if dirty_campaign_ids:
+            campaigns += (
+                Campaign.objects.filter(id__in=dirty_campaign_ids)
+                .annotate(
+                    **self.get_campaign_metadata_annotations(),
+                    **self.get_campaign_metric_annotations(),
+                )
+                .values(*self.campaign_values)
+            )
+        campaigns.sort(key=lambda campaign: campaign["id"])
+        return campaigns
+
+    def get_campaign_summary_fields(self):
+        """
+        Read the aggregated fields from the campaign summary, a materialized
+        view kept up to date by ``refresh_campaign_summary``.
+        """
+        return {
+            field: F(f"summary__{field}")
+            for field in [
+                "ad_group_count",
+                "ad_group_names",
+                "average_monthly_cost",
+                "average_cost_per_conversion",
+            ]
+        }
+
+    def get_campaign_metadata_annotations(self):
+        return {
+            "ad_group_count": Count("adgroup"),
+            "ad_group_names": ArrayAgg("adgroup__name", distinct=True),
+        }
+
+    def get_campaign_metric_annotations(self):
+        ad_group_stats = get_stats_queryset()
         average_monthly_cost_subquery = (
-            AdGroupStats.objects.filter(ad_group__campaign_id=OuterRef("id"))
+            ad_group_stats.filter(campaign_id=OuterRef("id"))
+            .values("campaign_id")
             .annotate(
-                month=TruncMonth("date"),
+                average_monthly_cost=Sum("cost")
+                / Count(TruncMonth("date"), distinct=True)
             )
-            .values(
-                "month",
-            )
-            .annotate(average_monthly_cost=Avg("cost"))
             .values("average_monthly_cost")
         )
         average_cost_per_conversion_subquery = (
-            AdGroupStats.objects.filter(ad_group__campaign_id=OuterRef("id"))
-            .values(
-                "ad_group__campaign_id",
-            )
+            ad_group_stats.filter(campaign_id=OuterRef("id"))
+            .values("campaign_id")
             .alias(
                 total_cost=Sum("cost"),
                 total_conversion=Sum("conversions"),
@@ -70,51 +158,136 @@ class CampaignsListCreate(ListAPIView, UpdateAPIView):
             )
             .values("average_cost_per_conversion")
         )
-        campaigns = Campaign.objects.annotate(
-            ad_group_count=Count("adgroup"),
-            ad_group_names=ArrayAgg("adgroup__name", distinct=True),
-            average_monthly_cost=Subquery(average_monthly_cost_subquery[:1]),
-            average_cost_per_conversion=Subquery(
+        return {
+            "average_monthly_cost": Subquery(average_monthly_cost_subquery[:1]),
+            "average_cost_per_conversion": Subquery(
                 average_cost_per_conversion_subquery[:1]
             ),
-        ).values(
-            "id",
-            "name",
-            "campaign_type",
-            "ad_group_count",
-            "ad_group_names",
-            "average_monthly_cost",
-            "average_cost_per_conversion",
-        )
-        serializer = CampaignSerializer(campaigns, many=True)
-        page = self.paginate_queryset(serializer.data)
-        return self.get_paginated_response(page)
+        }
 
     def patch(self, request, *args, **kwargs):
+        if isinstance(request.data, list):
+            return self.bulk_patch(request)
+
         campaign = get_object_or_404(Campaign, id=request.data["id"])
         serializer = CampaignSerializer(campaign, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         serializer.save()
         return Response(serializer.data)
 
+    def bulk_patch(self, request):
+        """
+        Update a list of ``{id, name}`` in one transaction. Nothing is updated
+        unless every item is valid, and the errors are returned per item.
+        """
+        serializer = CampaignBulkUpdateSerializer(
+            Campaign.objects.all(),
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=self.bulk_update_max_length,
+        )
+        serializer.is_valid(raise_exception=True)
+        campaigns = serializer.save()
+        return Response(CampaignSerializer(campaigns, many=True).data)
+
 
 class PerformanceTimeSeriesList(ListAPIView):
     pagination_class = LimitOffsetPagination
     permission_classes = [IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
-
+    authentication_classes = [CachedTokenAuthentication]
+
+    time_series_values = [
+        "time_granularity",
+        "total_cost",
+        "total_clicks",
+        "total_conversions",
+        "average_cost_per_conversion",
+        "average_cost_per_click",
+        "average_click_through_rate",
+        "average_conversion_rate",
+    ]
+    dimension_values = {"campaign": "campaign_id", "device": "device"}
+
+    @conditional_response
+    @cache_response
     def list(self, request, *args, **kwargs):
         data = request.query_params.dict().copy()
         if "campaigns" in data:
             data["campaigns"] = data["campaigns"].split(",")
 
+        if "group_by" in data:
+            data["group_by"] = data["group_by"].split(",")
+
         serializer = PerformanceTimeSeriesQuerySerializer(data=data)
         if not serializer.is_valid():
             return Response(serializer.errors, status=HTTP_400_BAD_REQUEST)
 
-        start_date = serializer.validated_data.get("start_date")
-        end_date = serializer.validated_data.get("end_date")
-        campaigns = serializer.validated_data.get("campaigns")
+        if serializer.validated_data.get("group_by"):
+            return Response(self.get_grouped_series(serializer.validated_data))
+
+        if serializer.validated_data.get("pagination") == "cursor":
+            self.pagination_class = TimeGranularityCursorPagination
+
+        if serializer.validated_data["engine"] == "numpy":
+            ad_group_stats = self.get_time_series_sums_queryset(
+                serializer.validated_data
+            )
+            page = compute_time_series_ratios(self.paginate_queryset(ad_group_stats))
+        else:
+            ad_group_stats = self.get_time_series_queryset(serializer.validated_data)
+            page = self.paginate_queryset(ad_group_stats)
+        return self.get_paginated_response(
+            [
+                serialize_output(PerformanceTimeSeriesMetricSerializer, row)
+                for row in page
+            ]
+        )
+
+    def get_grouped_series(self, validated_data):
+        """
+        Return every series of the requested dimensions from a single query. The
+        dimension values of a series are given once in ``key``, followed by one
+        array per metric.
+        """
+        dimensions = self.get_dimension_values(validated_data)
+        if validated_data["engine"] == "numpy":
+            rows = compute_time_series_ratios(
+                self.get_time_series_sums_queryset(validated_data), dimensions
+            )
+        else:
+            rows = self.get_time_series_queryset(validated_data)
+
+        series = []
+        for key, series_rows in groupby(
+            rows, key=lambda row: [row[dimension] for dimension in dimensions]
+        ):
+            series_rows = list(series_rows)
+            series.append(
+                {
+                    "key": key,
+                    **{
+                        value: [row[value] for row in series_rows]
+                        for value in self.time_series_values
+                    },
+                }
+            )
+        return {"dimensions": dimensions, "series": series}
+
+    def get_dimension_values(self, validated_data):
+        return [
+            self.dimension_values[dimension]
+            for dimension in dict.fromkeys(validated_data.get("group_by", []))
+        ]
+
+    def get_time_series_sums_queryset(self, validated_data):
+        """
+        Return the summed metrics of every time bucket, per requested dimension,
+        ordered by dimension and bucket.
+        """
+        start_date = validated_data.get("start_date")
+        end_date = validated_data.get("end_date")
+        campaigns = validated_data.get("campaigns")
 
         filter_condition = {}
         if start_date:
@@ -122,9 +295,9 @@ class PerformanceTimeSeriesList(ListAPIView):
         if end_date:
             filter_condition["date__lte"] = end_date
         if campaigns:
-            filter_condition["ad_group__campaign__id__in"] = campaigns
+            filter_condition["campaign_id__in"] = campaigns
 
-        time_granularity = serializer.validated_data.get("aggregate_by")
+        time_granularity = validated_data.get("aggregate_by")
         time_granularity_aggregate = {}
         match time_granularity:
             case "day":
@@ -134,22 +307,27 @@ class PerformanceTimeSeriesList(ListAPIView):
             case "month":
                 time_granularity_aggregate["time_granularity"] = TruncMonth("date")
 
-        group_by_values = ["time_granularity"]
+        dimensions = self.get_dimension_values(validated_data)
+        group_by_values = ["time_granularity", *dimensions]
 
-        final_values = [
-            "total_cost",
-            "total_clicks",
-            "total_conversions",
-            "average_cost_per_conversion",
-            "average_cost_per_click",
-            "average_click_through_rate",
-            "average_conversion_rate",
-        ]
+        return (
+            get_stats_queryset(start_date, end_date)
+            .filter(**filter_condition)
+            .annotate(**time_granularity_aggregate)
+            .values(
+                *group_by_values,
+            )
+            .annotate(
+                total_cost=Sum("cost"),
+                total_clicks=Sum("clicks"),
+                total_conversions=Sum("conversions"),
+                total_impressions=Sum("impressions"),
+            )
+            .order_by(*dimensions, "time_granularity")
+        )
 
+    def get_time_series_queryset(self, validated_data):
         ad_group_stats_metric = {
-            "total_cost": Sum("cost"),
-            "total_clicks": Sum("clicks"),
-            "total_conversions": Sum("conversions"),
             "average_cost_per_conversion": Case(
                 When(total_conversions=0, then=0),
                 default=F("total_cost") / F("total_conversions"),
@@ -161,139 +339,252 @@ class PerformanceTimeSeriesList(ListAPIView):
                 output_field=FloatField(),
             ),
             "average_click_through_rate": Case(
-                When(impressions=0, then=0),
-                default=F("clicks") / F("impressions"),
+                When(total_impressions=0, then=0),
+                default=Cast("total_clicks", FloatField()) / F("total_impressions"),
                 output_field=FloatField(),
             ),
             "average_conversion_rate": Case(
-                When(clicks=0, then=0),
-                default=F("conversions") / F("clicks"),
+                When(total_clicks=0, then=0),
+                default=F("total_conversions") / F("total_clicks"),
                 output_field=FloatField(),
             ),
         }
 
-        ad_group_stats = (
-            AdGroupStats.objects.filter(**filter_condition)
-            .annotate(
-                campaign_id=F("ad_group__campaign__id"), **time_granularity_aggregate
-            )
+        return (
+            self.get_time_series_sums_queryset(validated_data)
+            .annotate(**ad_group_stats_metric)
             .values(
-                *group_by_values,
+                *self.time_series_values, *self.get_dimension_values(validated_data)
             )
-            .annotate(**ad_group_stats_metric)
-            .order_by("time_granularity")
-            .values(*final_values)
         )
-        serializer = PerformanceTimeSeriesMetricSerializer(
-            data=list(ad_group_stats), many=True
+
+
+class PerformanceTimeSeriesExport(PerformanceTimeSeriesList):
+    raw_stats_values = [
+        "date",
+        "campaign_id",
+        "ad_group_id",
+        "device",
+        "impressions",
+        "clicks",
+        "conversions",
+        "cost",
+    ]
+
+    def list(self, request, *args, **kwargs):
+        data = request.query_params.dict().copy()
+        if "campaigns" in data:
+            data["campaigns"] = data["campaigns"].split(",")
+
+        serializer = PerformanceTimeSeriesExportQuerySerializer(data=data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=HTTP_400_BAD_REQUEST)
+
+        if serializer.validated_data["source"] == "raw":
+            queryset = self.get_raw_stats_queryset(serializer.validated_data)
+            values = self.raw_stats_values
+        else:
+            queryset = self.get_time_series_queryset(serializer.validated_data)
+            values = self.time_series_values
+
+        return stream_rows(
+            queryset,
+            values,
+            serializer.validated_data["file_format"],
+            filename=f"performance-time-series-{serializer.validated_data['source']}",
+        )
+
+    def get_raw_stats_queryset(self, validated_data):
+        filter_condition = {}
+        if validated_data.get("start_date"):
+            filter_condition["date__gte"] = validated_data["start_date"]
+        if validated_data.get("end_date"):
+            filter_condition["date__lte"] = validated_data["end_date"]
+        if validated_data.get("campaigns"):
+            filter_condition["ad_group__campaign_id__in"] = validated_data["campaigns"]
+
+        return (
+            AdGroupStats.objects.filter(**filter_condition)
+            .annotate(campaign_id=F("ad_group__campaign_id"))
+            .order_by("date", "id")
+            .values(*self.raw_stats_values)
         )
 
-        if serializer.is_valid():
-            page = self.paginate_queryset(serializer.data)
-            return self.get_paginated_response(page)
 
-        return Response(serializer.errors, status=HTTP_400_BAD_REQUEST)
+class AdGroupStatsParquetExport(APIView):
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [CachedTokenAuthentication]
+
+    def get(self, request, *args, **kwargs):
+        data = request.query_params.dict().copy()
+        for list_param in ["campaigns", "ad_groups"]:
+            if list_param in data:
+                data[list_param] = data[list_param].split(",")
+
+        serializer = AdGroupStatsExportQuerySerializer(data=data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=HTTP_400_BAD_REQUEST)
+
+        queryset = get_parquet_queryset(**serializer.validated_data)
+        return StreamingHttpResponse(
+            iter_parquet_file(queryset),
+            content_type="application/vnd.apache.parquet",
+            headers={
+                "Content-Disposition": 'attachment; filename="ad-group-stats.parquet"'
+            },
+        )
 
 
 class PerformanceComparisonRetrieve(RetrieveAPIView):
     permission_classes = [IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
-
+    authentication_classes = [CachedTokenAuthentication]
+
+    performance_metrics = [
+        "total_cost",
+        "total_clicks",
+        "total_conversions",
+        "total_impressions",
+        "cost_per_conversion",
+        "cost_per_click",
+        "cost_per_mile_impression",
+        "conversion_rate",
+        "click_through_rate",
+    ]
+
+    @conditional_response
+    @cache_response
     def get(self, request, *args, **kwargs):
-        serializer = PerformanceQuerySerializer(data=request.query_params)
+        serializer = self.get_query_serializer(request)
         if not serializer.is_valid():
             return Response(serializer.errors, status=HTTP_400_BAD_REQUEST)
 
-        start_date = serializer.validated_data.get("start_date")
-        end_date = serializer.validated_data.get("end_date")
-        compare_mode = serializer.validated_data.get("compare_mode")
-        date_delta = end_date - start_date
+        compare_modes = list(dict.fromkeys(serializer.validated_data["compare_mode"]))
+        date_ranges = self.get_date_ranges(serializer.validated_data, compare_modes)
+
+        performance_aggregate = {}
+        for prefix, date_range in date_ranges.items():
+            performance_aggregate.update(
+                self.get_performance_aggregate(prefix, date_range)
+            )
 
+        performance = (
+            get_stats_queryset(
+                min(date_range[0] for date_range in date_ranges.values()),
+                max(date_range[1] for date_range in date_ranges.values()),
+            )
+            .filter(
+                reduce(
+                    or_,
+                    [Q(date__range=date_range) for date_range in date_ranges.values()],
+                )
+            )
+            .aggregate(**performance_aggregate)
+        )
+        return Response(self.get_performance_data(performance, compare_modes))
+
+    def get_query_serializer(self, request):
+        data = request.query_params.dict().copy()
+        if "compare_mode" in data:
+            data["compare_mode"] = data["compare_mode"].split(",")
+        return PerformanceQuerySerializer(data=data)
+
+    def get_date_ranges(self, validated_data, compare_modes):
+        start_date = validated_data.get("start_date")
+        end_date = validated_data.get("end_date")
+
+        date_ranges = {"base": (start_date, end_date)}
+        for compare_mode in compare_modes:
+            date_ranges[compare_mode] = self.get_compared_date_range(
+                compare_mode, start_date, end_date
+            )
+        return date_ranges
+
+    def get_performance_data(self, performance, compare_modes):
+        compared_performances = {
+            compare_mode: {
+                f"compared_{metric}": performance[f"{compare_mode}_{metric}"]
+                for metric in self.performance_metrics
+            }
+            for compare_mode in compare_modes
+        }
+
+        response_data = serialize_output(
+            PerformanceMetricSerializer,
+            {
+                **{
+                    f"base_{metric}": performance[f"base_{metric}"]
+                    for metric in self.performance_metrics
+                },
+                **compared_performances[compare_modes[0]],
+            },
+        )
+
+        if len(compare_modes) > 1:
+            response_data["comparisons"] = {
+                compare_mode: serialize_output(
+                    ComparedPerformanceSerializer, compared_performance
+                )
+                for compare_mode, compared_performance in compared_performances.items()
+            }
+
+        return response_data
+
+    def get_compared_date_range(self, compare_mode, start_date, end_date):
         if compare_mode == "preceding":
             compared_end_date = start_date - relativedelta(days=1)
             compared_start_date = compared_end_date - relativedelta(
-                days=date_delta.days
+                days=(end_date - start_date).days
             )
         elif compare_mode == "previous_month":
             compared_end_date = end_date - relativedelta(months=1)
             compared_start_date = start_date - relativedelta(months=1)
 
-        base_performance = AdGroupStats.objects.filter(
-            date__range=(start_date, end_date)
-        ).aggregate(
-            base_total_cost=Sum("cost"),
-            base_total_clicks=Sum("clicks"),
-            base_total_conversions=Sum("conversions"),
-            base_total_impressions=Sum("impressions"),
-            base_cost_per_conversion=Case(
-                When(base_total_conversions=0, then=0),
-                default=F("base_total_cost") / F("base_total_conversions"),
-                output_field=FloatField(),
-            ),
-            base_cost_per_click=Case(
-                When(base_total_clicks=0, then=0),
-                default=F("base_total_cost") / F("base_total_clicks"),
-                output_field=FloatField(),
-            ),
-            base_cost_per_mile_impression=Case(
-                When(base_total_impressions=0, then=0),
-                default=F("base_total_cost") / F("base_total_impressions") * 1000,
-                output_field=FloatField(),
-            ),
-            base_conversion_rate=Case(
-                When(base_total_clicks=0, then=0),
-                default=F("base_total_conversions") / F("base_total_clicks"),
-                output_field=FloatField(),
-            ),
-            base_click_through_rate=Case(
-                When(base_total_impressions=0, then=0),
-                default=F("base_total_clicks") / F("base_total_impressions"),
-                output_field=FloatField(),
-            ),
-        )
-
-        compared_performance = AdGroupStats.objects.filter(
-            date__range=(compared_start_date, compared_end_date)
-        ).aggregate(
-            compared_total_cost=Sum("cost"),
-            compared_total_clicks=Sum("clicks"),
-            compared_total_conversions=Sum("conversions"),
-            compared_total_impressions=Sum("impressions"),
-            compared_cost_per_conversion=Case(
-                When(compared_total_conversions=0, then=0),
-                default=F("compared_total_cost") / F("compared_total_conversions"),
+        return compared_start_date, compared_end_date
+
+    def get_performance_aggregate(self, prefix, date_range):
+        in_range = Q(date__range=date_range)
+        return {
+            f"{prefix}_total_cost": Sum("cost", filter=in_range),
+            f"{prefix}_total_clicks": Sum("clicks", filter=in_range),
+            f"{prefix}_total_conversions": Sum("conversions", filter=in_range),
+            f"{prefix}_total_impressions": Sum("impressions", filter=in_range),
+            f"{prefix}_cost_per_conversion": Case(
+                When(**{f"{prefix}_total_conversions": 0}, then=0),
+                default=F(f"{prefix}_total_cost") / F(f"{prefix}_total_conversions"),
                 output_field=FloatField(),
             ),
-            compared_cost_per_click=Case(
-                When(compared_total_clicks=0, then=0),
-                default=F("compared_total_cost") / F("compared_total_clicks"),
+            f"{prefix}_cost_per_click": Case(
+                When(**{f"{prefix}_total_clicks": 0}, then=0),
+                default=F(f"{prefix}_total_cost") / F(f"{prefix}_total_clicks"),
                 output_field=FloatField(),
             ),
-            compared_cost_per_mile_impression=Case(
-                When(compared_total_impressions=0, then=0),
-                default=F("compared_total_cost")
-                / F("compared_total_impressions")
+            f"{prefix}_cost_per_mile_impression": Case(
+                When(**{f"{prefix}_total_impressions": 0}, then=0),
+                default=F(f"{prefix}_total_cost")
+                / F(f"{prefix}_total_impressions")
                 * 1000,
                 output_field=FloatField(),
             ),
-            compared_conversion_rate=Case(
-                When(compared_total_clicks=0, then=0),
-                default=F("compared_total_conversions") / F("compared_total_clicks"),
+            f"{prefix}_conversion_rate": Case(
+                When(**{f"{prefix}_total_clicks": 0}, then=0),
+                default=F(f"{prefix}_total_conversions") / F(f"{prefix}_total_clicks"),
                 output_field=FloatField(),
             ),
-            compared_click_through_rate=Case(
-                When(compared_total_impressions=0, then=0),
-                default=F("compared_total_clicks") / F("compared_total_impressions"),
+            f"{prefix}_click_through_rate": Case(
+                When(**{f"{prefix}_total_impressions": 0}, then=0),
+                default=Cast(f"{prefix}_total_clicks", FloatField())
+                / F(f"{prefix}_total_impressions"),
                 output_field=FloatField(),
             ),
-        )
+        }
 
-        serializer = PerformanceMetricSerializer(
-            data={**base_performance, **compared_performance}
-        )
-        serializer.is_valid()
 
-        return Response(serializer.data)
+class ResponseCacheStatsRetrieve(APIView):
+    permission_classes = [IsAdminUser]
+    authentication_classes = [CachedTokenAuthentication]
+
+    def get(self, request, *args, **kwargs):
+        return Response(get_response_cache_stats())
 
 
 class RegisterView(APIView):
@@ -322,3 +613,7 @@ class LoginView(KnoxLoginView):
             return Response({"error": "Invalid login credentials"}, status=401)
 
         return super(LoginView, self).post(request, format=None)
+
+
+class LogoutView(KnoxLogoutView):
+    authentication_classes = [CachedTokenAuthentication]
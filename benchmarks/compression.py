@@ -0,0 +1,91 @@
+"""
+Measure the bytes saved and the CPU time of every available response
+encoding, for time series pages and campaign lists of growing size, e.g.
+
+    python benchmarks/compression.py --repeat 20
+"""
+
+import argparse
+import os
+import random
+import statistics
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "marketing_api.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from analytics.middleware import COMPRESSORS  # noqa: E402
+from analytics.views import PerformanceTimeSeriesList  # noqa: E402
+
+
+def make_time_series(rows):
+    return {
+        "count": rows,
+        "results": [
+            {
+                value: random.uniform(0, 10_000)
+                for value in PerformanceTimeSeriesList.time_series_values[1:]
+            }
+            for _ in range(rows)
+        ],
+    }
+
+
+def make_campaigns(campaigns):
+    return {
+        "count": campaigns,
+        "results": [
+            {
+                "id": campaign,
+                "name": f"campaign-{campaign}",
+                "campaign_type": "SEARCH_STANDARD",
+                "ad_groups_count": 50,
+                "ad_group_names": [
+                    "".join(random.choices(string.ascii_lowercase, k=20))
+                    for _ in range(50)
+                ],
+                "average_monthly_cost": random.uniform(0, 10_000),
+                "average_cost_per_conversion": random.uniform(0, 100),
+            }
+            for campaign in range(campaigns)
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    payloads = {
+        **{f"time series {rows}": make_time_series(rows) for rows in [10, 100, 1095]},
+        **{f"campaigns {count}": make_campaigns(count) for count in [10, 100]},
+    }
+    for payload_name, payload in payloads.items():
+        content = JSONRenderer().render(payload)
+        print(f"{payload_name}: {len(content) / 1024:.1f} KB")
+        for encoding, compressor_class in COMPRESSORS.items():
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                compressor = compressor_class()
+                compressed = compressor.compress(content) + compressor.flush()
+                timings.append((time.perf_counter() - started) * 1000)
+            print(
+                f"{encoding:>8}: {len(compressed) / 1024:.1f} KB, "
+                f"{1 - len(compressed) / len(content):.0%} saved, "
+                f"p50 {statistics.median(timings):.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Print the query plans and the latency of the analytics GET endpoints.
+
+Run it against the same data set before and after a schema change to compare
+the plans, e.g.
+
+    python benchmarks/explain_endpoints.py --populate 500000
+    python manage.py migrate analytics 0006
+    python benchmarks/explain_endpoints.py --source raw
+    python manage.py migrate analytics
+    python benchmarks/explain_endpoints.py --source raw
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from urllib.parse import urlencode
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "marketing_api.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+from django.urls import resolve, reverse  # noqa: E402
+from rest_framework.test import APIRequestFactory, force_authenticate  # noqa: E402
+
+from analytics.enums import AdGroupDeviceChoices, CampaignTypeChoices  # noqa: E402
+from analytics.models import AdGroup, AdGroupStats, Campaign  # noqa: E402
+from analytics.rollups import mark_dates_dirty, refresh_daily_rollup  # noqa: E402
+
+BATCH_SIZE = 10_000
+
+
+def populate(rows, campaigns=20, ad_groups_per_campaign=10):
+    Campaign.objects.bulk_create(
+        [
+            Campaign(
+                id=campaign_id,
+                name=f"benchmark-{campaign_id}",
+                campaign_type=random.choice(CampaignTypeChoices.values),
+            )
+            for campaign_id in range(1, campaigns + 1)
+        ],
+        ignore_conflicts=True,
+    )
+    ad_group_ids = range(1, campaigns * ad_groups_per_campaign + 1)
+    AdGroup.objects.bulk_create(
+        [
+            AdGroup(
+                id=ad_group_id,
+                name=f"benchmark-{ad_group_id}",
+                campaign_id=(ad_group_id - 1) // ad_groups_per_campaign + 1,
+            )
+            for ad_group_id in ad_group_ids
+        ],
+        ignore_conflicts=True,
+    )
+
+    keys_per_day = len(ad_group_ids) * len(AdGroupDeviceChoices.values)
+    first_date = date.today() - timedelta(days=rows // keys_per_day + 1)
+    batch = []
+    for index in range(rows):
+        key, day = index % keys_per_day, index // keys_per_day
+        batch.append(
+            AdGroupStats(
+                date=first_date + timedelta(days=day),
+                ad_group_id=ad_group_ids[key // len(AdGroupDeviceChoices.values)],
+                device=AdGroupDeviceChoices.values[
+                    key % len(AdGroupDeviceChoices.values)
+                ],
+                impressions=random.randint(0, 10_000),
+                clicks=random.randint(0, 500),
+                conversions=random.random() * 20,
+                cost=random.random() * 1_000,
+            )
+        )
+        if len(batch) == BATCH_SIZE:
+            AdGroupStats.objects.bulk_create(batch)
+            batch = []
+    AdGroupStats.objects.bulk_create(batch)
+    mark_dates_dirty(first_date + timedelta(days=day) for day in range(day + 1))
+    with connection.cursor() as cursor:
+        cursor.execute(f"ANALYZE {AdGroupStats._meta.db_table}")
+
+
+def get_endpoints():
+    last_date = AdGroupStats.objects.order_by("-date").values_list("date", flat=True)
+    last_date = last_date.first() or date.today()
+    campaign_ids = Campaign.objects.order_by("id").values_list("id", flat=True)[:3]
+    return [
+        ("campaigns", {}),
+        (
+            "performance-time-series",
+            {
+                "aggregate_by": "day",
+                "start_date": last_date - timedelta(days=90),
+                "end_date": last_date,
+            },
+        ),
+        (
+            "performance-time-series",
+            {
+                "aggregate_by": "month",
+                "campaigns": ",".join(str(campaign_id) for campaign_id in campaign_ids),
+            },
+        ),
+        (
+            "performance-comparison",
+            {
+                "compare_mode": "preceding,previous_month",
+                "start_date": last_date - timedelta(days=30),
+                "end_date": last_date,
+            },
+        ),
+    ]
+
+
+def call_endpoint(url_name, params, user):
+    url = f"{reverse(url_name)}?{urlencode(params)}"
+    view = resolve(reverse(url_name)).func
+    view.cls.throttle_classes = []
+    request = APIRequestFactory().get(url, HTTP_HOST=settings.ALLOWED_HOSTS[0])
+    force_authenticate(request, user=user)
+    response = view(request)
+    response.render()
+    return response
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--populate", type=int, default=0, metavar="ROWS")
+    parser.add_argument("--source", choices=["raw", "rollup"], default="raw")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--no-plans", action="store_true")
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Serve the repeated calls from the response cache.",
+    )
+    args = parser.parse_args()
+
+    if args.populate:
+        populate(args.populate)
+    settings.ANALYTICS_DAILY_ROLLUP = args.source == "rollup"
+    settings.ANALYTICS_RESPONSE_CACHE = args.cache
+    if args.source == "rollup":
+        refresh_daily_rollup()
+
+    user, _ = User.objects.get_or_create(username="benchmark")
+    print(f"AdGroupStats rows: {AdGroupStats.objects.count()}, source: {args.source}")
+    for url_name, params in get_endpoints():
+        with CaptureQueriesContext(connection) as queries:
+            call_endpoint(url_name, params, user)
+
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            call_endpoint(url_name, params, user)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        print(f"\n=== {url_name} {urlencode(params)}")
+        print(
+            f"{len(queries)} queries, "
+            f"p50 {statistics.median(timings):.1f} ms, "
+            f"max {max(timings):.1f} ms"
+        )
+        if args.no_plans:
+            continue
+        for query in queries:
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {query['sql']}")
+                print("\n".join(row[0] for row in cursor.fetchall()))
+
+
+if __name__ == "__main__":
+    main()
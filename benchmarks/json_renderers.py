@@ -0,0 +1,92 @@
+"""
+Compare the render time of JSONRenderer and ORJSONRenderer for a page of a
+daily time series and a grouped series of three years, e.g.
+
+    python benchmarks/json_renderers.py --campaigns 20 --repeat 20
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "marketing_api.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from analytics.renderers import ORJSONRenderer  # noqa: E402
+from analytics.views import PerformanceTimeSeriesList  # noqa: E402
+
+DAYS = 1095
+
+
+def make_time_series():
+    return {
+        "count": DAYS,
+        "next": None,
+        "previous": None,
+        "results": [
+            {
+                value: random.uniform(0, 10_000)
+                for value in PerformanceTimeSeriesList.time_series_values[1:]
+            }
+            for _ in range(DAYS)
+        ],
+    }
+
+
+def make_grouped_series(campaigns):
+    days = [date(2022, 1, 1) + timedelta(days=day) for day in range(DAYS)]
+    return {
+        "dimensions": ["campaign_id"],
+        "series": [
+            {
+                "key": [campaign],
+                "time_granularity": days,
+                **{
+                    value: [random.uniform(0, 10_000) for _ in days]
+                    for value in PerformanceTimeSeriesList.time_series_values[1:]
+                },
+            }
+            for campaign in range(campaigns)
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--campaigns", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    payloads = {
+        "time series": make_time_series(),
+        "grouped series": make_grouped_series(args.campaigns),
+    }
+    for payload_name, payload in payloads.items():
+        rendered = {}
+        for renderer in [JSONRenderer(), ORJSONRenderer()]:
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                rendered[type(renderer)] = renderer.render(payload)
+                timings.append((time.perf_counter() - started) * 1000)
+            print(
+                f"{payload_name:>14} {type(renderer).__name__:>14}: "
+                f"{len(rendered[type(renderer)]) / 1024:.0f} KB, "
+                f"p50 {statistics.median(timings):.2f} ms"
+            )
+        assert rendered[JSONRenderer] == rendered[ORJSONRenderer], "Outputs differ"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Load an API with concurrent clients and print its latency percentiles.
+
+Start the server with USER_THROTTLE_RATE raised and the response cache off,
+then compare the sync and async stacks, e.g.
+
+    USER_THROTTLE_RATE=100000/min ANALYTICS_RESPONSE_CACHE=False \\
+        python manage.py runserver --noreload 8000
+    USER_THROTTLE_RATE=100000/min ANALYTICS_RESPONSE_CACHE=False \\
+        uvicorn marketing_api.asgi:application --port 8001 --workers 1
+    python benchmarks/load_test.py http://localhost:8000/analytics/api/v1/campaigns/
+    python benchmarks/load_test.py http://localhost:8001/analytics/api/v1/async/campaigns/
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "marketing_api.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from knox.models import AuthToken  # noqa: E402
+
+
+def get_token():
+    user, _ = User.objects.get_or_create(username="benchmark")
+    return AuthToken.objects.create(user)[1]
+
+
+def call(url, token):
+    request = Request(url, headers={"Authorization": f"Token {token}"})
+    started = time.perf_counter()
+    try:
+        with urlopen(request) as response:
+            response.read()
+            status = response.status
+    except HTTPError as error:
+        status = error.code
+    return status, (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("url")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--token", help="Knox token. A new one is created by default.")
+    args = parser.parse_args()
+
+    token = args.token or get_token()
+    call(args.url, token)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(args.concurrency) as executor:
+        results = list(
+            executor.map(lambda _: call(args.url, token), range(args.requests))
+        )
+    elapsed = time.perf_counter() - started
+
+    timings = sorted(timing for _, timing in results)
+    errors = sum(status != 200 for status, _ in results)
+    print(
+        f"{args.requests} requests, concurrency {args.concurrency}, "
+        f"{errors} errors, {args.requests / elapsed:.1f} req/s, "
+        f"p50 {statistics.median(timings):.1f} ms, "
+        f"p99 {timings[int(len(timings) * 0.99) - 1]:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
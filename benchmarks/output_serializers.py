@@ -0,0 +1,89 @@
+"""
+Compare writing time series rows through DRF serializer validation and
+through ``serialize_output``, for a three year daily series, e.g.
+
+    python benchmarks/output_serializers.py --rows 1095 --repeat 20
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "marketing_api.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from analytics.serializers import (  # noqa: E402
+    PerformanceTimeSeriesMetricSerializer,
+    serialize_output,
+)
+
+
+def make_rows(count):
+    rows = []
+    for day in range(count):
+        cost = random.uniform(0, 10_000)
+        clicks = random.randint(1, 5_000)
+        conversions = random.uniform(1, 500)
+        impressions = clicks * random.randint(10, 100)
+        rows.append(
+            {
+                "time_granularity": date(2022, 1, 1) + timedelta(days=day),
+                "total_cost": cost,
+                "total_clicks": clicks,
+                "total_conversions": conversions,
+                "average_cost_per_conversion": cost / conversions,
+                "average_cost_per_click": cost / clicks,
+                "average_click_through_rate": clicks / impressions,
+                "average_conversion_rate": conversions / clicks,
+            }
+        )
+    return rows
+
+
+def run_serializer(rows):
+    serializer = PerformanceTimeSeriesMetricSerializer(data=rows, many=True)
+    serializer.is_valid(raise_exception=True)
+    return serializer.data
+
+
+def run_serialize_output(rows):
+    return [
+        serialize_output(PerformanceTimeSeriesMetricSerializer, row) for row in rows
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1095)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    results = {}
+    for name, run in [
+        ("serializer", run_serializer),
+        ("serialize_output", run_serialize_output),
+    ]:
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            results[name] = run(rows)
+            timings.append((time.perf_counter() - started) * 1000)
+        print(
+            f"{name:>16}: {args.rows} rows, "
+            f"p50 {statistics.median(timings):.2f} ms, max {max(timings):.2f} ms"
+        )
+    assert results["serializer"] == results["serialize_output"], "Outputs differ"
+
+
+if __name__ == "__main__":
+    main()
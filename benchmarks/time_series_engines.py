@@ -0,0 +1,79 @@
+"""
+Compare the sql and numpy engines of the performance time series.
+
+Both engines sum the metrics per bucket in PostgreSQL. The sql engine also
+computes the ratios with CASE expressions, the numpy engine computes them in
+one vectorized pass over the fetched sums, e.g.
+
+    python benchmarks/time_series_engines.py --source raw --repeat 20
+"""
+
+import argparse
+import math
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "marketing_api.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+
+from analytics.engines import compute_time_series_ratios  # noqa: E402
+from analytics.models import AdGroupStats  # noqa: E402
+from analytics.rollups import refresh_daily_rollup  # noqa: E402
+from analytics.views import PerformanceTimeSeriesList  # noqa: E402
+
+
+def run_sql_engine(view, validated_data):
+    return list(view.get_time_series_queryset(validated_data))
+
+
+def run_numpy_engine(view, validated_data):
+    return compute_time_series_ratios(
+        view.get_time_series_sums_queryset(validated_data)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--source", choices=["raw", "rollup"], default="rollup")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    settings.ANALYTICS_DAILY_ROLLUP = args.source == "rollup"
+    if args.source == "rollup":
+        refresh_daily_rollup()
+
+    view = PerformanceTimeSeriesList()
+    print(f"AdGroupStats rows: {AdGroupStats.objects.count()}, source: {args.source}")
+    for aggregate_by in ["day", "week", "month"]:
+        validated_data = {"aggregate_by": aggregate_by}
+        results = {}
+        for engine, run in [("sql", run_sql_engine), ("numpy", run_numpy_engine)]:
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                results[engine] = run(view, validated_data)
+                timings.append((time.perf_counter() - started) * 1000)
+            print(
+                f"{aggregate_by:>5} {engine:>5}: {len(results[engine])} buckets, "
+                f"p50 {statistics.median(timings):.1f} ms, "
+                f"max {max(timings):.1f} ms"
+            )
+        for sql_row, numpy_row in zip(results["sql"], results["numpy"]):
+            assert sql_row.keys() == numpy_row.keys(), "Engines disagree"
+            for field, value in sql_row.items():
+                assert value == numpy_row[field] or math.isclose(
+                    value, numpy_row[field]
+                ), f"Engines disagree on {field}"
+
+
+if __name__ == "__main__":
+    main()
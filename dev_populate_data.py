@@ -1,6 +1,8 @@
 import csv
 
-from analytics.models import AdGroup, AdGroupStats, Campaign
+from django.core.management import call_command
+
+from analytics.models import AdGroup, Campaign
 
 print("Populating Campaigns...")
 campaigns = []
@@ -35,21 +37,4 @@ ad_groups = AdGroup.objects.bulk_create(ad_groups)
 print(f"{len(ad_groups)} ad groups added.")
 
 print("Populating AdGroupStats...")
-ad_group_stats = []
-with open("ad_group_stats.csv", "r") as file:
-    reader = csv.DictReader(file)
-    for row in reader:
-        ad_group_stats.append(
-            AdGroupStats(
-                date=row["date"],
-                ad_group_id=row["ad_group_id"],
-                device=row["device"],
-                impressions=row["impressions"],
-                clicks=row["clicks"],
-                conversions=row["conversions"],
-                cost=row["cost"],
-            )
-        )
-
-ad_group_stats = AdGroupStats.objects.bulk_create(ad_group_stats)
-print(f"{len(ad_group_stats)} ad group stats added.")
+call_command("ingest_stats", "ad_group_stats.csv")
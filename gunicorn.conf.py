@@ -0,0 +1,45 @@
+import glob
+import multiprocessing
+import os
+
+wsgi_app = os.getenv("GUNICORN_APP", "marketing_api.wsgi:application")
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+
+workers = int(
+    os.getenv(
+        "GUNICORN_WORKERS",
+        multiprocessing.cpu_count() if os.getenv("REDIS_URL") else 1,
+    )
+)
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+
+if workers > 1 and not os.getenv("REDIS_URL"):
+    raise RuntimeError(
+        "Set REDIS_URL to run more than one worker, so that the workers share "
+        "the throttle counters, the token cache and the cached responses."
+    )
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = 30
+keepalive = 5
+max_requests = 1000
+max_requests_jitter = 100
+
+accesslog = "-"
+errorlog = "-"
+
+
+def on_starting(server):
+    # Metrics files of a previous run would be added to the new counters.
+    metrics_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if metrics_dir:
+        for path in glob.glob(os.path.join(metrics_dir, "*.db")):
+            os.remove(path)
+
+
+def child_exit(server, worker):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
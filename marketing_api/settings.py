@@ -35,7 +35,10 @@ if os.getenv("DEBUG") == "True":
     INSTALLED_APPS.append("silk")
 
 MIDDLEWARE = [
+    "analytics.middleware.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "analytics.middleware.QueryBudgetMiddleware",
+    "analytics.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -70,9 +73,20 @@ WSGI_APPLICATION = "marketing_api.wsgi.application"
 
 
 DATABASES = {
-    "default": dj_database_url.config(default=DATABASE_URL),
+    "default": dj_database_url.config(
+        default=DATABASE_URL,
+        conn_max_age=int(os.getenv("CONN_MAX_AGE", "60")),
+        conn_health_checks=os.getenv("CONN_HEALTH_CHECKS", "True") == "True",
+    ),
 }
 
+if os.getenv("DATABASE_POOL", "True") == "True":
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"].setdefault("OPTIONS", {})["pool"] = {
+        "min_size": int(os.getenv("DATABASE_POOL_MIN_SIZE", "2")),
+        "max_size": int(os.getenv("DATABASE_POOL_MAX_SIZE", "10")),
+    }
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -112,14 +126,87 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticated",
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "knox.auth.TokenAuthentication",
+        "analytics.authentication.CachedTokenAuthentication",
     ],
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.UserRateThrottle",
+        "analytics.throttling.SlidingWindowUserRateThrottle",
     ],
     "DEFAULT_THROTTLE_RATES": {
-        "user": "5/min",
+        "user": os.getenv("USER_THROTTLE_RATE", "5/min"),
     },
 }
 
+if os.getenv("ANALYTICS_ORJSON_RENDERER", "False") == "True":
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] = [
+        "analytics.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ]
+
 KNOX_EXPIRY = timedelta(hours=0.5)
+
+ANALYTICS_AUTH_TOKEN_CACHE_TIMEOUT = int(
+    os.getenv("ANALYTICS_AUTH_TOKEN_CACHE_TIMEOUT", "300")
+)
+
+ANALYTICS_AUTH_TOKEN_LOCAL_CACHE_TIMEOUT = int(
+    os.getenv("ANALYTICS_AUTH_TOKEN_LOCAL_CACHE_TIMEOUT", "10")
+)
+
+ANALYTICS_DAILY_ROLLUP = os.getenv("ANALYTICS_DAILY_ROLLUP", "True") == "True"
+
+ANALYTICS_CAMPAIGN_SUMMARY = os.getenv("ANALYTICS_CAMPAIGN_SUMMARY", "True") == "True"
+
+ANALYTICS_COMPRESSION_MIN_SIZE = int(
+    os.getenv("ANALYTICS_COMPRESSION_MIN_SIZE", "1024")
+)
+
+ANALYTICS_COMPRESSION_ENCODINGS = os.getenv(
+    "ANALYTICS_COMPRESSION_ENCODINGS", "br,zstd,gzip"
+).split(",")
+
+ANALYTICS_METRICS_TOKEN = os.getenv("ANALYTICS_METRICS_TOKEN")
+
+ANALYTICS_QUERY_BUDGET_STRICT = (
+    os.getenv("ANALYTICS_QUERY_BUDGET_STRICT", "False") == "True"
+)
+
+ANALYTICS_QUERY_BUDGET_TIME = int(os.getenv("ANALYTICS_QUERY_BUDGET_TIME", "500"))
+
+ANALYTICS_QUERY_BUDGETS = {
+    "campaigns": {"queries": 8, "time": ANALYTICS_QUERY_BUDGET_TIME},
+    "performance-time-series": {"queries": 5, "time": ANALYTICS_QUERY_BUDGET_TIME},
+    "performance-time-series-export": {
+        "queries": 3,
+        "time": ANALYTICS_QUERY_BUDGET_TIME,
+    },
+    "ad-group-stats-parquet": {"queries": 3, "time": ANALYTICS_QUERY_BUDGET_TIME},
+    "performance-comparison": {"queries": 4, "time": ANALYTICS_QUERY_BUDGET_TIME},
+    "async-campaigns": {"queries": 8, "time": ANALYTICS_QUERY_BUDGET_TIME},
+    "async-performance-comparison": {
+        "queries": 6,
+        "time": ANALYTICS_QUERY_BUDGET_TIME,
+    },
+    "response-cache-stats": {"queries": 2, "time": ANALYTICS_QUERY_BUDGET_TIME},
+}
+
+ANALYTICS_RESPONSE_CACHE = os.getenv("ANALYTICS_RESPONSE_CACHE", "True") == "True"
+
+ANALYTICS_RESPONSE_CACHE_TIMEOUT = int(
+    os.getenv("ANALYTICS_RESPONSE_CACHE_TIMEOUT", "300")
+)
+
+REDIS_URL = os.getenv("REDIS_URL")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }